@@ -0,0 +1,233 @@
+# ===============================================================
+# موتور async: AsyncTeleBot + asyncio به‌جای threadها ⚡
+# ===============================================================
+# با BOT_ENGINE=async فعال می‌شه. همون catalog، router، user_states و
+# هندلرهای main استفاده می‌شن؛ فقط درخواست‌های خروجی به‌جای بلاک کردن
+# یک thread روی requests، به شکل coroutine روی یک session مشترک aiohttp
+# (با سقف اتصال ASYNC_POOL_SIZE) فرستاده می‌شن. پس هزاران ارسال هم‌زمان
+# فقط هزاران coroutine هستن، نه هزاران thread.
+#
+# ترتیب: هر چت صف خودش رو داره (ChatLanes) و درخواست‌های یک چت پشت‌سرهم
+# اجرا می‌شن؛ چت‌های مختلف کاملاً هم‌زمان. پاسخ منوها و ارسال فایل‌ها
+# صف‌های جدا دارن تا منوها پشت آپلودها منتظر نمونن (مثل حالت sync).
+
+import asyncio
+import threading
+import time
+from collections import deque
+
+from telebot import asyncio_helper
+from telebot.async_telebot import AsyncTeleBot
+from telebot.asyncio_helper import ApiTelegramException
+
+from delivery import INPUT_MEDIA, copy_batches, plan_batches
+
+
+class ChatLanes:
+    def __init__(self):
+        self.loop = None
+        # chat_id -> کارهای منتظر (تابع‌هایی که coroutine برمی‌گردونن)
+        self._pending = {}
+        self._tasks = set()
+
+    def bind(self, loop):
+        self.loop = loop
+
+    def submit(self, chat_id, job):
+        # از هر threadی قابل صدا زدنه (مثلاً تایمر گروه مدیا)؛ call_soon_threadsafe
+        # ترتیب صدا زدن‌ها رو حفظ می‌کنه
+        self.loop.call_soon_threadsafe(self._submit, chat_id, job)
+
+    def _submit(self, chat_id, job):
+        jobs = self._pending.get(chat_id)
+        if jobs is not None:
+            jobs.append(job)
+            return
+        self._pending[chat_id] = deque([job])
+        task = self.loop.create_task(self._drain(chat_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _drain(self, chat_id):
+        jobs = self._pending[chat_id]
+        while jobs:
+            job = jobs.popleft()
+            try:
+                await job()
+            except Exception as e:
+                print(f"Async request to {chat_id} failed: {e}")
+        del self._pending[chat_id]
+
+    def depth(self):
+        return sum(len(jobs) for jobs in self._pending.values())
+
+    async def join(self):
+        # صبر تا همه‌ی صف‌ها خالی بشن (کارهایی که وسط کار اضافه می‌شن هم حساب)
+        await asyncio.sleep(0)
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks))
+            await asyncio.sleep(0)
+
+
+class AsyncApi:
+    # همون متدهای ارسال TeleBot (send_message, send_document, ...) که
+    # هندلرهای main صدا می‌زنن؛ ولی فقط کار رو در صف چت می‌ذاره و برمی‌گرده
+    def __init__(self, abot, limiter=None):
+        self.abot = abot
+        self.limiter = limiter
+        self.lanes = ChatLanes()
+
+    def __getattr__(self, name):
+        method = getattr(self.abot, name)
+
+        def call(chat_id, *args, **kwargs):
+            self.lanes.submit(chat_id, lambda: self.request(method, chat_id, *args, **kwargs))
+        return call
+
+    async def request(self, method, chat_id, *args, **kwargs):
+        # محدودکننده‌ی مشترک با حالت sync: اینجا به‌جای sleep، await می‌شه
+        retries = self.limiter.MAX_429_RETRIES if self.limiter else 0
+        for attempt in range(retries + 1):
+            if self.limiter:
+                wait = self.limiter.reserve(chat_id)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            started = time.perf_counter()
+            try:
+                result = await method(chat_id, *args, **kwargs)
+            except ApiTelegramException as e:
+                self.observe(method, e.error_code, started)
+                if e.error_code != 429 or attempt == retries:
+                    raise
+                retry_after = int((e.result_json or {}).get('parameters', {}).get('retry_after', 1))
+                print(f"429 from Telegram, retrying after {retry_after}s (chat {chat_id})")
+                self.limiter.penalize(chat_id, retry_after)
+            except Exception:
+                self.observe(method, 'error', started)
+                raise
+            else:
+                self.observe(method, 200, started)
+                return result
+
+    def observe(self, method, status, started):
+        # همون شمارنده‌های حالت sync، با اسم متد Bot API (send_message -> sendMessage)
+        if self.limiter is not None:
+            first, *rest = method.__name__.split('_')
+            self.limiter.observe(first + ''.join(w.capitalize() for w in rest), status, started)
+
+
+class AsyncDeliveryQueue:
+    # همون رابط DeliveryQueue (submit / depth / stats)
+    def __init__(self, api, albums=True):
+        self.api = api
+        self.albums = albums
+        self.lanes = ChatLanes()
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def submit(self, chat_id, items):
+        enqueued = time.monotonic()
+        self.submitted += 1
+        self.lanes.submit(chat_id, lambda: self.run_job(chat_id, items, enqueued))
+
+    async def run_job(self, chat_id, items, enqueued):
+        try:
+            await self.send_items(chat_id, items)
+            self.completed += 1
+        except Exception as e:
+            self.failed += 1
+            print(f"Delivery to {chat_id} failed: {e}")
+        latency = time.monotonic() - enqueued
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+    async def send_items(self, chat_id, items):
+        for batch in plan_batches(items, self.albums):
+            if isinstance(batch, list):
+                await self.send_album(chat_id, batch)
+            else:
+                await self.send_item(chat_id, batch)
+
+    async def send_item(self, chat_id, item):
+        kind, value, caption = item
+        bot = self.api.abot
+        if kind == 'message':
+            return await self.api.request(bot.send_message, chat_id, value)
+        try:
+            if kind == 'copy':
+                from_chat, batches = copy_batches(value)
+                return [await self.api.request(bot.copy_messages, chat_id, from_chat, ids) for ids in batches]
+            return await self.api.request(getattr(bot, f"send_{kind}"), chat_id, value, caption=caption)
+        except Exception as e:
+            print(f"Error sending {kind} {value}: {e}")
+            await self.api.request(bot.send_message, chat_id, f"❗ خطا در ارسال فایل: {e}")
+
+    async def send_album(self, chat_id, album):
+        media = [INPUT_MEDIA[kind](value, caption=caption) for kind, value, caption in album]
+        try:
+            return await self.api.request(self.api.abot.send_media_group, chat_id, media)
+        except Exception as e:
+            print(f"Error sending album of {len(album)}: {e}")
+            for item in album:
+                await self.send_item(chat_id, item)
+
+    def depth(self):
+        return self.lanes.depth()
+
+    def stats(self):
+        done = self.completed + self.failed
+        return {
+            'depth': self.depth(),
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'latency_avg': round(self.latency_total / done, 3) if done else 0.0,
+            'latency_max': round(self.latency_max, 3),
+        }
+
+
+class AsyncEngine:
+    def __init__(self, token, limiter=None, albums=True, pool_size=100):
+        # همه‌ی درخواست‌ها از یک ClientSession با حداکثر pool_size اتصال رد می‌شن
+        asyncio_helper.REQUEST_LIMIT = pool_size
+        self.abot = AsyncTeleBot(token)
+        self.api = AsyncApi(self.abot, limiter)
+        self.deliveries = AsyncDeliveryQueue(self.api, albums=albums)
+        self.loop = None
+
+    def bind(self, loop):
+        self.loop = loop
+        self.api.lanes.bind(loop)
+        self.deliveries.lanes.bind(loop)
+
+    def start(self):
+        # حالت webhook: آپدیت‌ها از threadهای Flask میان و event loop فقط
+        # برای ارسال‌ها در یک thread جدا اجرا می‌شه
+        loop = asyncio.new_event_loop()
+        self.bind(loop)
+        threading.Thread(target=loop.run_forever, name="async-engine", daemon=True).start()
+        return self
+
+    async def join(self):
+        await self.api.lanes.join()
+        await self.deliveries.lanes.join()
+
+    async def poll(self, dispatcher, poller):
+        # آپدیت‌ها با AsyncTeleBot گرفته می‌شن و به هندلرهای همون TeleBot
+        # اصلی (threaded=False) در یک thread جدا داده می‌شن؛ ارسال‌هاشون با
+        # call_soon_threadsafe در صف چت‌ها روی همین loop می‌ره
+        self.bind(asyncio.get_running_loop())
+        await self.abot.delete_webhook()
+        await poller.run_async(self.abot, dispatcher)
+
+    def run(self, dispatcher, poller):
+        async def main():
+            try:
+                await self.poll(dispatcher, poller)
+            finally:
+                await self.abot.close_session()
+        asyncio.run(main())
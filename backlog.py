@@ -0,0 +1,86 @@
+# ===============================================================
+# آپدیت‌های مونده از زمان خاموشی ربات 💤
+# ===============================================================
+# وقتی سرور رایگان خوابیده یا ری‌استارت شده، تلگرام همه‌ی دکمه‌هایی که
+# کاربرها زدن رو یک‌جا می‌فرسته. آپدیت‌های قدیمی‌تر از max_age ثانیه
+# یکی‌یکی اجرا نمی‌شن: پیام‌های متنی هر کاربر (از همه‌ی دسته‌های getUpdates)
+# جمع می‌شن و وقتی SETTLE ثانیه پیام قدیمی تازه‌ای نرسید یک‌جا به drain
+# داده می‌شن تا فقط آخرین منو (و بسته به تنظیمات، ارسال فایل‌ها) انجام بشه.
+# آپدیت‌های تازه بدون صبر برای این کار به هندلرها می‌رسن؛ اگه کاربری پیام
+# تازه بفرسته، پیام‌های قدیمیِ هنوز اجرانشده‌اش کنار گذاشته می‌شن.
+# فقط پیام‌هایی که collapsible قبولشون داره (دکمه‌های منوها) خلاصه می‌شن؛
+# بقیه‌ی آپدیت‌های قدیمی (دستورها، «پایان دریافت فایل‌ها»، فایل‌هایی که ادمین
+# برای /get_ids فرستاده و ...) مثل قبل پردازش می‌شن.
+
+import threading
+import time
+
+from polling import update_date
+
+
+class Backlog:
+    SETTLE = 0.5
+
+    def __init__(self, max_age, drain, collapsible=None, clock=time.time):
+        self.max_age = max_age
+        self.drain = drain
+        # collapsible(message) -> bool؛ None یعنی همه‌ی پیام‌های متنی
+        self.collapsible = collapsible
+        self.clock = clock
+        self._lock = threading.Lock()
+        # user_id -> پیام‌های متنی قدیمی به ترتیب
+        self._pending = {}
+        self._last_stale = 0.0
+        self._worker = None
+        self.stale = 0
+        self.superseded = 0
+        self.drained_users = 0
+
+    def is_stale(self, update, now):
+        date = update_date(update)
+        return date is not None and now - date > self.max_age
+
+    def filter(self, updates):
+        # آپدیت‌هایی که باید عادی پردازش بشن رو برمی‌گردونه
+        now = self.clock()
+        passed = []
+        with self._lock:
+            for update in updates:
+                message = update.message
+                if message is None or message.text is None or message.from_user is None:
+                    passed.append(update)
+                elif not self.is_stale(update, now):
+                    self.superseded += len(self._pending.pop(message.from_user.id, ()))
+                    passed.append(update)
+                elif self.collapsible is not None and not self.collapsible(message):
+                    passed.append(update)
+                else:
+                    self._pending.setdefault(message.from_user.id, []).append(message)
+                    self.stale += 1
+                    self._last_stale = time.monotonic()
+            if self._pending and self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="backlog", daemon=True)
+                self._worker.start()
+        return passed
+
+    def _run(self):
+        while True:
+            with self._lock:
+                wait = self._last_stale + self.SETTLE - time.monotonic()
+                if wait <= 0:
+                    pending, self._pending = self._pending, {}
+                    self.drained_users += len(pending)
+                    self._worker = None
+                    break
+            time.sleep(wait)
+        if not pending:
+            return
+        try:
+            self.drain(pending)
+        except Exception as e:
+            print(f"Error draining stale updates: {e}")
+
+    def stats(self):
+        with self._lock:
+            return {'stale': self.stale, 'superseded': self.superseded,
+                    'drained_users': self.drained_users, 'pending_users': len(self._pending)}
@@ -0,0 +1,98 @@
+# ===============================================================
+# بنچمارک صف آپدیت‌های مونده از زمان خاموشی
+# ربات واقعی (python main.py در حالت polling، با محدودکننده‌ی پیش‌فرض
+# 30/s کل و 1/s هر چت) در برابر سرور محلی fake Bot API. قبل از روشن شدن
+# ربات در صف تلگرام هست:
+#   - کاربرهای قدیمی: هر کدوم ۱۰ دقیقه پیش تا یک منوی درس رفتن و دو دکمه‌ی
+#     ارسال فایل زدن
+#   - کاربرهای تازه: همین الان /start زدن (بعد از همه‌ی قدیمی‌ها در صف)
+# زمان تا جواب گرفتن همه‌ی کاربرهای تازه و تعداد درخواست‌هایی که برای
+# آپدیت‌های قدیمی فرستاده شد، با BACKLOG_MAX_AGE=0 (خاموش) و 120.
+# اجرا:  python benchmarks/bench_backlog.py
+# ===============================================================
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+from bench_workers import find_scenario, free_port, make_update  # noqa: E402
+from catalog import load_catalog  # noqa: E402
+from fake_bot_api import FakeBotApi  # noqa: E402
+
+STALE_USERS = 60
+FRESH_USERS = 20
+STALE_AGE = 600
+LATENCY = 0.02
+
+
+def sends(api):
+    return sum(1 for method, _ in api.calls if method != 'getUpdates')
+
+
+def run(api, max_age, texts):
+    api.reset()
+    api.updates.clear()
+    update_id = 0
+    stale_chats = [20000 + n for n in range(STALE_USERS)]
+    fresh_chats = [30000 + n for n in range(FRESH_USERS)]
+    for text in texts:
+        for chat_id in stale_chats:
+            update_id += 1
+            update = make_update(update_id, chat_id, text)
+            update["message"]["date"] -= STALE_AGE
+            api.push_update(update)
+    for chat_id in fresh_chats:
+        update_id += 1
+        api.push_update(make_update(update_id, chat_id, "/start"))
+
+    tmp = tempfile.mkdtemp()
+    env = dict(os.environ, BOT_TOKEN="1:bench", BOT_API_URL=api.api_url, PORT=str(free_port()),
+               STATE_DB=os.path.join(tmp, "states.db"), POLL_TIMEOUT="1",
+               BACKLOG_MAX_AGE=str(max_age), ALBUM_DELIVERY="0")
+    env.pop("ENV", None)
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "main.py")], cwd=tmp, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for chat_id in fresh_chats:
+            assert api.wait_for(chat_id, timeout=300), f"no reply for fresh chat {chat_id}"
+        fresh = time.perf_counter() - started
+        # کارهای قدیمی هم تموم بشن (دیگه درخواستی نیاد)
+        settled = sends(api)
+        while True:
+            time.sleep(2)
+            if sends(api) == settled:
+                break
+            settled = sends(api)
+        done = time.perf_counter() - started - 2
+    finally:
+        proc.kill()
+        proc.wait()
+        # getUpdates بازِ پروسه‌ی کشته‌شده (POLL_TIMEOUT=1) اول تموم بشه
+        time.sleep(1.5)
+    stale_calls = sum(len(api.by_chat.get(str(chat_id), ())) for chat_id in stale_chats)
+    return fresh, done, stale_calls
+
+
+def main():
+    catalog = load_catalog(os.path.join(ROOT, "catalog.json"))
+    path, sends = find_scenario(catalog)
+    texts = ["/start"] + [text for text, _ in path] + [text for text, _ in sends]
+    api = FakeBotApi(latency=LATENCY).start()
+    print(f"{STALE_USERS} stale users x {len(texts)} updates ({STALE_AGE}s old), "
+          f"then {FRESH_USERS} fresh /start, default rate limits")
+    print(f"{'backlog':10}{'fresh served s':>16}{'all done s':>12}{'stale API calls':>17}")
+    for label, max_age in (("off", 0), ("120s", 120)):
+        fresh, done, stale_calls = run(api, max_age, texts)
+        print(f"{label:10}{fresh:>16.2f}{done:>12.2f}{stale_calls:>17}")
+    api.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# ===============================================================
+# بنچمارک ارسال از کانال ذخیره با copy_messages
+# بزرگ‌ترین دکمه‌ی catalog.json (یک پیام + ۳۹ ویدیو) برای چند کاربر
+# هم‌زمان، با محدودکننده‌ی پیش‌فرض main (30/s کل، 1/s هر چت) در برابر
+# سرور محلی fake Bot API، به سه روش:
+#   - تکی: هر فایل یک sendVideo
+#   - آلبوم: sendMediaGroup های ۱۰تایی (پیش‌فرض فعلی)
+#   - کانال: همون پیام + یک آیتم copy برای بازه‌ی پیام‌های کانال ذخیره
+# بررسی می‌شه که کاربر همه‌ی پیام‌ها رو به ترتیب درست گرفته باشه.
+# اجرا:  python benchmarks/bench_copy_messages.py
+# ===============================================================
+
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+from telebot import apihelper  # noqa: E402
+
+from catalog import SEND, compile_catalog  # noqa: E402
+from delivery import send_items  # noqa: E402
+from fake_bot_api import FakeBotApi  # noqa: E402
+
+USERS = 10
+LATENCY = 0.02
+STORAGE_CHAT = -1001234567890
+FIRST_MESSAGE = 1001
+
+
+def biggest_button(data):
+    # بزرگ‌ترین لیست send در داده‌ی خام catalog.json
+    best = None
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        for button in node.get('buttons', []):
+            if 'buttons' in button:
+                stack.append(button)
+            if len(button.get('send', ())) > len(best.get('send', ()) if best else ()):
+                best = button
+    return best
+
+
+def storage_variant(data, button):
+    # همون دکمه، ولی فایل‌ها یک بازه از پیام‌های کانال ذخیره
+    files = [item for item in button['send'] if 'message' not in item]
+    messages = [item for item in button['send'] if 'message' in item]
+    button['send'] = messages + [{'copy': [FIRST_MESSAGE, FIRST_MESSAGE + len(files) - 1]}]
+    data['storage_chat'] = STORAGE_CHAT
+    return compile_catalog(data)
+
+
+def items_of(catalog, text):
+    for node in catalog.nodes.values():
+        action = node.actions.get(text)
+        if action is not None and action[0] == SEND:
+            return action[1]
+
+
+def run(api, bot, items, albums):
+    api.reset()
+    chats = [60000 + n for n in range(USERS)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(USERS) as pool:
+        list(pool.map(lambda chat_id: send_items(bot, chat_id, items, albums), chats))
+    elapsed = time.perf_counter() - started
+    for chat_id in chats:
+        calls = api.by_chat[str(chat_id)]
+        copied = [n for method, params in calls if method == 'copyMessages'
+                  for n in json.loads(params['message_ids'])]
+        assert copied == sorted(copied), f"chat {chat_id} got copies out of order"
+    return len(api.calls) / USERS, elapsed
+
+
+def main():
+    api = FakeBotApi(latency=LATENCY).start()
+    apihelper.API_URL = api.api_url
+    os.environ.setdefault("BOT_TOKEN", "1:bench")
+    os.environ["FILE_CHECK_INTERVAL"] = "0"
+    os.chdir(tempfile.mkdtemp())
+    import main as bot_main
+
+    with open(os.path.join(ROOT, "catalog.json"), encoding='utf-8') as f:
+        data = json.load(f)
+    button = biggest_button(data)
+    text = button['button']
+    original = items_of(bot_main.catalog, text)
+    stored = items_of(storage_variant(data, button), text)
+
+    print(f"«{text}»: {len(original)} items, {USERS} users at once, default rate limits")
+    print(f"{'delivery':10}{'calls/user':>12}{'all done s':>12}")
+    for label, items, albums in (("single", original, False), ("albums", original, True),
+                                 ("channel", stored, True)):
+        calls, elapsed = run(api, bot_main.bot, items, albums)
+        print(f"{label:10}{calls:>12.0f}{elapsed:>12.2f}")
+    api.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# ===============================================================
+# بنچمارک هزینه‌ی مسیریابی هر پیام: زنجیره‌ی lambda در برابر جدول مسیرها
+# اجرا:  python benchmarks/bench_dispatch.py
+# ===============================================================
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("BOT_TOKEN", "1:bench")
+os.chdir(tempfile.mkdtemp())
+
+import telebot  # noqa: E402
+from telebot import types  # noqa: E402
+
+import main  # noqa: E402
+from router import ANY_STATE  # noqa: E402
+
+USER_ID = 1000
+ROUNDS = 2000
+
+
+def make_message(text, message_id=1):
+    return types.Message.de_json({
+        "message_id": message_id,
+        "date": 0,
+        "chat": {"id": USER_ID, "type": "private"},
+        "from": {"id": USER_ID, "is_bot": False, "first_name": "bench"},
+        "text": text,
+    })
+
+
+def build_predicate_bot(states):
+    # بازسازی رفتار قدیمی: یک predicate برای هر هندلر، به ترتیب ثبت
+    groups = {}
+    for (state, text), handler in main.router.routes():
+        g = groups.setdefault(handler, (set(), set()))
+        g[0].add(state)
+        g[1].add(text)
+
+    legacy = telebot.TeleBot("1:bench", threaded=False)
+    hits = []
+    for handler, (g_states, g_texts) in groups.items():
+        if ANY_STATE in g_states:
+            func = (lambda texts: lambda msg: msg.text in texts)(g_texts)
+        else:
+            func = (lambda texts, sts: lambda msg: msg.text in texts and states.get(msg.from_user.id) in sts)(g_texts, g_states)
+        legacy.register_message_handler(lambda m, h=handler: hits.append(h), func=func)
+    legacy.register_message_handler(lambda m: hits.append(None), content_types=['text'])
+    return legacy, hits, len(groups)
+
+
+def build_router_bot(states):
+    fast = telebot.TeleBot("1:bench", threaded=False)
+    hits = []
+
+    def dispatch(msg):
+        hits.append(main.router.resolve(states.get(msg.from_user.id), msg.text))
+    fast.register_message_handler(dispatch, content_types=['text'])
+    return fast, hits
+
+
+def measure(bot, messages):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        bot.process_new_messages(messages)
+    return (time.perf_counter() - start) / (ROUNDS * len(messages)) * 1e6
+
+
+def main_bench():
+    states = {}
+    legacy, legacy_hits, predicates = build_predicate_bot(states)
+    fast, fast_hits = build_router_bot(states)
+
+    last_state, last_text = next(k for k, _ in reversed(main.router.routes()) if k[0] is not ANY_STATE)
+    cases = [
+        ("global button", None, "📘 ترم 1"),
+        ("last registered button", last_state, last_text),
+        ("unknown text (worst case)", "HOME", "سلام"),
+    ]
+
+    print(f"routes: {len(main.router)}   legacy predicates: {predicates}")
+    print(f"{'case':<28}{'predicates us/update':>22}{'router us/update':>20}{'speedup':>10}")
+    for name, state, text in cases:
+        states[USER_ID] = state
+        messages = [make_message(text)]
+        legacy_hits.clear()
+        fast_hits.clear()
+        old = measure(legacy, messages)
+        new = measure(fast, messages)
+        assert legacy_hits[0] is fast_hits[0], name
+        print(f"{name:<28}{old:>22.2f}{new:>20.2f}{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,107 @@
+# ===============================================================
+# مقایسه‌ی موتور sync (TeleBot + thread) و async (AsyncTeleBot + asyncio)
+# در برابر سرور محلی fake Bot API:
+#   menu replies: هر چت یک پاسخ منو (sync: دو thread هندلر پیش‌فرض TeleBot)
+#   deliveries:   هر چت چند فایل (sync: DeliveryQueue با ۸ خط)
+# ترتیب پیام‌های هر چت در هر دو حالت بررسی می‌شه.
+# اجرا:  python benchmarks/bench_engines.py [chats]
+# ===============================================================
+
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import telebot  # noqa: E402
+from telebot import apihelper, asyncio_helper  # noqa: E402
+
+from async_engine import AsyncEngine  # noqa: E402
+from delivery import DeliveryQueue  # noqa: E402
+from fake_bot_api import FakeBotApi  # noqa: E402
+
+ITEMS_PER_CHAT = 4
+LATENCY = 0.05
+HANDLER_THREADS = 2
+DELIVERY_LANES = 8
+POOL_SIZE = 100
+
+
+def check_order(api, expected):
+    for chat_id, calls in api.by_chat.items():
+        assert [p['text'] for _, p in calls] == expected, f"chat {chat_id} out of order"
+
+
+def sync_replies(api, chats):
+    bot = telebot.TeleBot("1:bench")
+    with ThreadPoolExecutor(HANDLER_THREADS) as pool:
+        for chat_id in range(1, chats + 1):
+            pool.submit(bot.send_message, chat_id, "menu")
+
+
+def sync_deliveries(api, chats):
+    bot = telebot.TeleBot("1:bench")
+    deliveries = DeliveryQueue(bot, lanes=DELIVERY_LANES, albums=False).start()
+    for chat_id in range(1, chats + 1):
+        deliveries.submit(chat_id, [('message', str(i), None) for i in range(ITEMS_PER_CHAT)])
+    deliveries.join()
+
+
+def async_run(work):
+    async def main():
+        engine = AsyncEngine("1:bench", albums=False, pool_size=POOL_SIZE)
+        engine.bind(asyncio.get_running_loop())
+        work(engine)
+        await engine.join()
+        await engine.abot.close_session()
+    asyncio.run(main())
+
+
+def async_replies(api, chats):
+    def work(engine):
+        for chat_id in range(1, chats + 1):
+            engine.api.send_message(chat_id, "menu")
+    async_run(work)
+
+
+def async_deliveries(api, chats):
+    def work(engine):
+        for chat_id in range(1, chats + 1):
+            engine.deliveries.submit(chat_id, [('message', str(i), None) for i in range(ITEMS_PER_CHAT)])
+    async_run(work)
+
+
+def measure(api, run, chats, expected):
+    api.reset()
+    started = time.perf_counter()
+    run(api, chats)
+    elapsed = time.perf_counter() - started
+    check_order(api, expected)
+    assert len(api.by_chat) == chats
+    return elapsed, len(api.calls) / elapsed, api.max_inflight
+
+
+def main():
+    chats = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    api = FakeBotApi(latency=LATENCY).start()
+    apihelper.API_URL = api.api_url
+    asyncio_helper.API_URL = api.api_url
+
+    print(f"{chats} chats, {LATENCY * 1000:.0f} ms per API call, rate limiter off")
+    print(f"{'scenario':28}{'seconds':>9}{'calls/s':>10}{'in flight':>11}")
+    scenarios = [
+        ("menu replies / sync", sync_replies, ["menu"]),
+        ("menu replies / async", async_replies, ["menu"]),
+        ("deliveries / sync", sync_deliveries, [str(i) for i in range(ITEMS_PER_CHAT)]),
+        ("deliveries / async", async_deliveries, [str(i) for i in range(ITEMS_PER_CHAT)]),
+    ]
+    for label, run, expected in scenarios:
+        elapsed, rate, inflight = measure(api, run, chats, expected)
+        print(f"{label:28}{elapsed:>9.2f}{rate:>10.0f}{inflight:>11}")
+    api.stop()
+
+
+if __name__ == "__main__":
+    main()
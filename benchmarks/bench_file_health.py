@@ -0,0 +1,128 @@
+# ===============================================================
+# بنچمارک / آزمایش بررسی پس‌زمینه‌ی file_idها
+# main واقعی (همین پروسه، با محدودکننده‌ی پیش‌فرض 30/s) در برابر سرور
+# محلی fake Bot API. چند file_id از catalog.json خراب علامت می‌خورن
+# (getFile برای اون‌ها 400 برمی‌گردونه). بعد از یک دور کامل بررسی می‌شه که:
+#   - برای هر فایل واقعی فقط یک getFile زده شده (نه یک بار برای هر تکرار)،
+#     به‌جز خراب‌ها که بعد از اولین 400 یک بار دیگه بررسی می‌شن
+#   - دقیقاً همون فایل‌ها خراب تشخیص داده شدن و ادمین خبردار شده
+#   - ارسال دکمه‌ای که فایل خراب داره اون فایل رو رد می‌کنه و بقیه رو می‌فرسته
+#   - گزارش CSV همه‌ی فایل‌ها رو داره، خراب‌ها اول
+#   - بعد از ری‌استارت (FileHealth تازه روی همون دیتابیس) چیزی دوباره بررسی نمی‌شه
+#   - فایلی که قبلاً سالم بوده (و با file_unique_id شناخته می‌شه) اگه بعداً
+#     خراب بشه هم به ادمین خبر داده می‌شه
+# اجرا:  python benchmarks/bench_file_health.py
+# ===============================================================
+
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from telebot import apihelper, types  # noqa: E402
+
+from bench_workers import find_scenario  # noqa: E402
+from fake_bot_api import FakeBotApi  # noqa: E402
+
+LATENCY = 0.02
+BROKEN = 5
+ADMIN = 7
+STUDENT = 50000
+
+
+def getfile_calls(api):
+    return sum(1 for method, _ in api.calls if method == 'getFile')
+
+
+def main():
+    api = FakeBotApi(latency=LATENCY).start()
+    apihelper.API_URL = api.api_url
+    os.environ.setdefault("BOT_TOKEN", "1:bench")
+    os.environ.update(ADMIN_CHAT_ID=str(ADMIN), FILE_CHECK_INTERVAL="0.001", ALBUM_DELIVERY="0")
+    os.chdir(tempfile.mkdtemp())
+    import main as bot_main
+    from file_health import FileHealth
+
+    catalog = bot_main.catalog
+    _, sends = find_scenario(catalog)
+    button, items = sends[0]
+    files = [value for kind, value, _ in items if kind != 'message']
+    broken = set(files[:1])
+    for meta in catalog.unique_files():
+        if len(broken) >= BROKEN:
+            break
+        broken.add(meta.file_id)
+    api.broken_file_ids.update(broken)
+
+    mentions = sum(len(used) for used in catalog.file_mentions().values())
+    total = len(catalog.unique_files())
+    print(f"{total} files ({mentions} mentions) in catalog, {len(broken)} broken")
+
+    health = bot_main.file_health
+    bot_main.scheduler.start()
+    bot_main.deliveries.start()
+    started = time.perf_counter()
+    bot_main.scheduler.schedule("file-health", 0, bot_main.check_files_periodically)
+    # دور اول: فایل‌های با اولین 400 تا ERROR_RETRY ثانیه دوباره بررسی نمی‌شن
+    while health.stats()['checks'] < total:
+        time.sleep(0.05)
+    time.sleep(0.2)
+    assert health.stats()['checks'] == total, "a file was rechecked before ERROR_RETRY"
+    assert not health.reload(), "a single 400 marked a file broken"
+    # ساعت FileHealth جلو می‌ره تا بررسی دوم بدون صبر ده‌دقیقه‌ای انجام بشه
+    health.clock = lambda: time.time() + health.ERROR_RETRY
+    while health.stats()['checks'] < total + len(broken):
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - started
+    calls = getfile_calls(api)
+    print(f"full scan: {calls} getFile calls in {elapsed:.1f}s ({calls / elapsed:.1f}/s), "
+          f"{len(broken)} of them second checks after a 400")
+    assert calls == total + len(broken), "a file was checked more than once"
+    assert bot_main.file_health.reload() == broken, "wrong broken set"
+    api.wait_for(ADMIN, count=len(broken))
+    assert len(api.by_chat[str(ADMIN)]) == len(broken), "admin not told about every broken file"
+
+    message = types.Message.de_json({
+        "message_id": 1, "date": int(time.time()), "text": button,
+        "chat": {"id": STUDENT, "type": "private"},
+        "from": {"id": STUDENT, "is_bot": False, "first_name": "bench"}})
+    bot_main.deliver(message, items)
+    assert api.wait_for(STUDENT, count=len(items))
+    sent = [params for _, params in api.by_chat[str(STUDENT)]]
+    delivered = {params.get('document') or params.get('video') or params.get('voice') for params in sent}
+    assert not delivered & broken and len(sent) == len(items), "broken file was sent"
+    print(f"button «{button}»: {len(items) - 1} of {len(items)} items sent, "
+          f"last message: {sent[-1]['text']!r}")
+
+    rows = list(csv.reader(io.StringIO(bot_main.file_report_csv())))
+    assert len(rows) == total + 1 and {row[2] for row in rows[1:1 + len(broken)]} == broken
+    print(f"report: {len(rows) - 1} rows, broken first")
+
+    before = getfile_calls(api)
+    restarted = FileHealth(bot_main.STATE_DB)
+    assert restarted.step(bot_main.bot, catalog.unique_files()) == (None, None)
+    print(f"after restart: {getfile_calls(api) - before} getFile calls, "
+          f"{len(restarted.known())} files known by file_unique_id")
+    bot_main.scheduler.stop()
+
+    # یک فایل سالم و شناخته‌شده خراب می‌شه؛ دو بررسی پشت‌سرهم (مستقیم، بدون زمان‌بند)
+    meta = next(meta for meta in catalog.unique_files()
+                if meta.file_id not in broken and catalog.files.get(file_id=meta.file_id))
+    api.broken_file_ids.add(meta.file_id)
+    alerts = len(api.by_chat[str(ADMIN)])
+    for _ in range(2):
+        health._db().execute("UPDATE file_health SET checked = 0 WHERE file_id = ?", (meta.file_id,))
+        bot_main.check_files_periodically()
+    assert api.wait_for(ADMIN, count=alerts + 1), "no alert for a known file that broke"
+    assert meta.file_id in api.by_chat[str(ADMIN)][-1][1]['text']
+    print("known file turned broken: admin alerted")
+    api.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# ===============================================================
+# بنچمارک توان ارسال بر حسب تعداد خط‌های ارسال (lanes)
+# در برابر سرور محلی fake Bot API؛ ترتیب پیام‌های هر چت هم بررسی می‌شه.
+# اجرا:  python benchmarks/bench_lanes.py
+# ===============================================================
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import telebot  # noqa: E402
+from telebot import apihelper  # noqa: E402
+
+from delivery import DeliveryQueue  # noqa: E402
+from fake_bot_api import FakeBotApi  # noqa: E402
+
+CHATS = 32
+JOBS_PER_CHAT = 2
+ITEMS_PER_JOB = 5
+LATENCY = 0.02
+
+
+def run(api, lanes):
+    api.reset()
+    bot = telebot.TeleBot("1:bench")
+    deliveries = DeliveryQueue(bot, lanes=lanes, albums=False).start()
+
+    started = time.perf_counter()
+    for job in range(JOBS_PER_CHAT):
+        for chat_id in range(1, CHATS + 1):
+            items = [('message', f"{job}:{i}", None) for i in range(ITEMS_PER_JOB)]
+            deliveries.submit(chat_id, items)
+    deliveries.join()
+    elapsed = time.perf_counter() - started
+
+    expected = [f"{job}:{i}" for job in range(JOBS_PER_CHAT) for i in range(ITEMS_PER_JOB)]
+    for chat_id, calls in api.by_chat.items():
+        assert [p['text'] for _, p in calls] == expected, f"chat {chat_id} out of order"
+    return len(api.calls) / elapsed
+
+
+def main():
+    api = FakeBotApi(latency=LATENCY).start()
+    apihelper.API_URL = api.api_url
+    print(f"{CHATS} chats x {JOBS_PER_CHAT} jobs x {ITEMS_PER_JOB} messages, "
+          f"{LATENCY * 1000:.0f} ms per API call")
+    print(f"{'lanes':>6}{'calls/s':>12}{'speedup':>10}")
+    base = None
+    for lanes in (1, 2, 4, 8, 16, 32):
+        rate = run(api, lanes)
+        base = base or rate
+        print(f"{lanes:>6}{rate:>12.1f}{rate / base:>9.1f}x")
+    api.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# ===============================================================
+# بنچمارک جمع کردن گروه‌های مدیا: یک threading.Timer برای هر عکس (روش
+# قبلی، اینجا دوباره پیاده شده) در برابر زمان‌بند مشترک main.
+# چند آلبوم ۱۰ تایی هم‌زمان از چت‌های مختلف می‌رسن (هر عکس چند میلی‌ثانیه
+# بعد از قبلی، روی ۸ thread هندلر). اندازه‌گیری: تعداد threadهای ساخته‌شده،
+# بیشترین thread زنده، و زمان از آخرین عکس آلبوم تا پیام «گروه مدیا دریافت شد».
+# بررسی می‌شه که هر آلبوم دقیقاً یک بار و کامل پردازش بشه.
+# اجرا:  python benchmarks/bench_media_groups.py
+# ===============================================================
+
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from telebot import apihelper, types  # noqa: E402
+
+from fake_bot_api import FakeBotApi  # noqa: E402
+
+ALBUMS = 50
+ALBUM_SIZE = 10
+ITEM_GAP = 0.005
+HANDLER_THREADS = 8
+
+
+def make_message(chat_id, group_id, n):
+    return types.Message.de_json({
+        "message_id": n + 1, "date": int(time.time()), "media_group_id": group_id,
+        "chat": {"id": chat_id, "type": "private"},
+        "from": {"id": chat_id, "is_bot": False, "first_name": "bench"},
+        "photo": [{"file_id": f"photo-{group_id}-{n}", "file_unique_id": f"u-{group_id}-{n}",
+                   "width": 90, "height": 90}]})
+
+
+def legacy_handler(main):
+    # همون کد قبلی handle_all_files / process_media_group با Timer
+    groups = {}
+    lock = threading.Lock()
+
+    def process(group_id):
+        with lock:
+            group = groups.get(group_id)
+            if group is None or group['timer'] is not threading.current_thread():
+                return
+            del groups[group_id]
+        messages = sorted(group['messages'], key=lambda m: m.message_id)
+        main.api.send_message(messages[0].chat.id, f"📎 یک گروه مدیا با {len(messages)} فایل دریافت شد.")
+
+    def handle(message):
+        with lock:
+            group = groups.setdefault(message.media_group_id, {'messages': [], 'timer': None})
+            group['messages'].append(message)
+            if group['timer'] is not None:
+                group['timer'].cancel()
+            timer = threading.Timer(2.0, process, args=[message.media_group_id])
+            group['timer'] = timer
+            timer.start()
+    return handle
+
+
+class ThreadCounter:
+    def __init__(self):
+        self.started = 0
+        self.peak = threading.active_count()
+        self._original = threading.Thread.start
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        counter = self
+
+        def start(thread):
+            counter.started += 1
+            counter._original(thread)
+        threading.Thread.start = start
+        threading.Thread(target=self._sample, daemon=True).start()
+        return self
+
+    def _sample(self):
+        while not self._stop.wait(0.005):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        threading.Thread.start = self._original
+
+
+def run(api, main, handle):
+    api.reset()
+    chats = [40000 + n for n in range(ALBUMS)]
+    last_item = {}
+    replied = {}
+
+    def wait_reply(chat_id):
+        if api.wait_for(chat_id, timeout=30):
+            replied[chat_id] = time.perf_counter()
+    # منتظرها قبل از شمارش threadها ساخته می‌شن
+    waiters = [threading.Thread(target=wait_reply, args=(chat_id,)) for chat_id in chats]
+    for waiter in waiters:
+        waiter.start()
+
+    with ThreadCounter() as threads, ThreadPoolExecutor(HANDLER_THREADS) as pool:
+        baseline = threading.active_count()
+        for n in range(ALBUM_SIZE):
+            futures = [pool.submit(handle, make_message(chat_id, f"g{chat_id}", n)) for chat_id in chats]
+            time.sleep(ITEM_GAP)
+        for chat_id, future in zip(chats, futures):
+            future.add_done_callback(lambda _, c=chat_id: last_item.setdefault(c, time.perf_counter()))
+        for waiter in waiters:
+            waiter.join()
+        time.sleep(0.3)
+    for chat_id in chats:
+        calls = api.by_chat[str(chat_id)]
+        assert chat_id in replied, f"album of {chat_id} not processed"
+        assert len(calls) == 1 and f"{ALBUM_SIZE} فایل" in calls[0][1]['text'], f"album {chat_id} wrong"
+    latency = [replied[c] - last_item[c] for c in chats]
+    return threads.started, threads.peak - baseline, statistics.median(latency), max(latency)
+
+
+def main():
+    api = FakeBotApi(latency=0.005).start()
+    apihelper.API_URL = api.api_url
+    os.environ.setdefault("BOT_TOKEN", "1:bench")
+    os.environ["RATE_LIMIT_GLOBAL"] = "1000000"
+    os.chdir(tempfile.mkdtemp())
+    import main as bot_main
+    bot_main.scheduler.start()
+
+    print(f"{ALBUMS} albums x {ALBUM_SIZE} photos at once, {HANDLER_THREADS} handler threads")
+    print(f"{'aggregation':14}{'threads made':>14}{'peak extra':>12}{'p50 wait s':>12}{'max wait s':>12}")
+    for label, handle in (("Timer/photo", legacy_handler(bot_main)), ("scheduler", bot_main.handle_all_files)):
+        started, peak, p50, worst = run(api, bot_main, handle)
+        print(f"{label:14}{started:>14}{peak:>12}{p50:>12.2f}{worst:>12.2f}")
+    api.stop()
+
+
+if __name__ == "__main__":
+    main()
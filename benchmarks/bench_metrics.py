@@ -0,0 +1,110 @@
+# ===============================================================
+# بنچمارک هزینه‌ی شمارنده‌های /metrics
+# ۱) هزینه‌ی هر inc / observe با ۱ و ۸ thread هم‌زمان، در برابر یک
+#    شمارنده‌ی معمولی پشت threading.Lock
+# ۲) هزینه‌ی هر scrape (render) با همون شمارنده‌ها
+# ۳) dispatch_text واقعی main (با ارسال به fake API) برای چند صد پیام، با و
+#    بدون ثبت متریک
+# اجرا:  python benchmarks/bench_metrics.py
+# ===============================================================
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from telebot import apihelper, types  # noqa: E402
+
+from bench_workers import find_scenario, make_update  # noqa: E402
+from fake_bot_api import FakeBotApi  # noqa: E402
+from metrics import Metrics  # noqa: E402
+
+OPS = 200000
+ROUTES = 50
+MESSAGES = 200
+
+
+class LockedCounters:
+    # روش معمولی: یک dict مشترک پشت یک قفل
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.values = {}
+
+    def inc(self, name, labels=(), value=1):
+        with self._lock:
+            key = (name, labels)
+            self.values[key] = self.values.get(key, 0) + value
+
+
+def hammer(threads, work):
+    started = time.perf_counter()
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - started) / (threads * OPS) * 1e9
+
+
+def micro():
+    labels = [(('route', f"r{n}"),) for n in range(ROUTES)]
+    print(f"{'op':24}{'1 thread ns':>14}{'8 threads ns':>14}")
+    for label, make in (("Lock + dict inc", LockedCounters), ("Metrics.inc", Metrics),
+                        ("Metrics.observe", Metrics)):
+        row = []
+        for threads in (1, 8):
+            registry = make()
+            if isinstance(registry, Metrics):
+                registry.counter('c', "bench")
+                registry.histogram('h', "bench")
+            if label == "Metrics.observe":
+                def work():
+                    for i in range(OPS):
+                        registry.observe('h', 0.003, labels[i % ROUTES])
+            else:
+                def work():
+                    for i in range(OPS):
+                        registry.inc('c', labels[i % ROUTES])
+            row.append(hammer(threads, work))
+        print(f"{label:24}{row[0]:>14.0f}{row[1]:>14.0f}")
+    started = time.perf_counter()
+    text = registry.render()
+    print(f"scrape: {len(text.splitlines())} lines in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+def end_to_end():
+    api = FakeBotApi(latency=0).start()
+    apihelper.API_URL = api.api_url
+    os.environ.setdefault("BOT_TOKEN", "1:bench")
+    os.environ.update(RATE_LIMIT_GLOBAL="1000000", RATE_LIMIT_CHAT="1000000", FILE_CHECK_INTERVAL="0")
+    os.chdir(tempfile.mkdtemp())
+    import main as bot_main
+
+    path, _ = find_scenario(bot_main.catalog)
+    texts = ["/start"] + [text for text, _ in path]
+    messages = [types.Update.de_json(make_update(n + 1, 70000 + n % 100, texts[n % len(texts)])).message
+                for n in range(MESSAGES)]
+    results = {}
+    for label in ("metrics off", "metrics on", "metrics off", "metrics on"):
+        registry = bot_main.metrics
+        observe, inc = registry.observe, registry.inc
+        if label == "metrics off":
+            registry.observe = registry.inc = lambda *args, **kwargs: None
+        started = time.perf_counter()
+        for message in messages:
+            bot_main.dispatch_text(message)
+        results.setdefault(label, []).append((time.perf_counter() - started) / MESSAGES * 1e6)
+        registry.observe, registry.inc = observe, inc
+    print(f"dispatch_text + sendMessage to a local fake API, {MESSAGES} messages (best of 2):")
+    for label, runs in results.items():
+        print(f"  {label:12}{min(runs):>8.0f} us/message")
+    api.stop()
+
+
+if __name__ == "__main__":
+    micro()
+    end_to_end()
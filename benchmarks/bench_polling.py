@@ -0,0 +1,105 @@
+# ===============================================================
+# بنچمارک polling: تنظیمات قبلی (infinity_polling با long_polling_timeout=2
+# و همه‌ی نوع آپدیت‌ها) در برابر Poller (timeout طولانی، فقط message،
+# دسته‌ی تطبیقی) در برابر سرور محلی fake Bot API:
+#   idle:  تعداد getUpdates در دقیقه وقتی هیچ آپدیتی نیست
+#   burst: یک‌جا ۳۰۰ آپدیت (۲۰۰ پیام + ۱۰۰ آپدیت بی‌استفاده مثل
+#          edited_message) و زمان تا رسیدن اولین و آخرین پاسخ
+# هندلر همون پاسخ یک پیامی رو می‌ده (مثل منوها) روی threadهای TeleBot.
+# اجرا:  python benchmarks/bench_polling.py [idle_seconds]
+# ===============================================================
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import telebot  # noqa: E402
+from telebot import apihelper  # noqa: E402
+
+from fake_bot_api import FakeBotApi  # noqa: E402
+from polling import Poller  # noqa: E402
+
+LATENCY = 0.02
+MESSAGES = 200
+NOISE = 100
+
+
+def make_bot():
+    bot = telebot.TeleBot("1:bench")
+
+    @bot.message_handler(content_types=['text'])
+    def reply(message):
+        bot.send_message(message.chat.id, "menu")
+    return bot
+
+
+def start_old(bot):
+    threading.Thread(target=bot.infinity_polling, daemon=True,
+                     kwargs={"timeout": 10, "long_polling_timeout": 2, "logger_level": None}).start()
+    return bot.stop_bot
+
+
+def start_new(bot):
+    poller = Poller()
+    threading.Thread(target=poller.run, args=(bot,), daemon=True).start()
+    return poller.stop
+
+
+def burst(api, first_id):
+    updates = []
+    for i in range(MESSAGES + NOISE):
+        chat_id = 1000 + i
+        message = {"message_id": i + 1, "date": int(time.time()), "text": "/start",
+                   "chat": {"id": chat_id, "type": "private"},
+                   "from": {"id": chat_id, "is_bot": False, "first_name": "bench"}}
+        kind = "message" if i % 3 != 2 else "edited_message"
+        updates.append({"update_id": first_id + i, kind: message})
+    return updates
+
+
+def count_polls(api):
+    return sum(1 for method, _ in api.calls if method == 'getUpdates')
+
+
+def measure(api, start, idle_seconds):
+    api.reset()
+    api.updates.clear()
+    bot = make_bot()
+    stop = start(bot)
+    time.sleep(idle_seconds)
+    idle = count_polls(api) / idle_seconds * 60
+
+    polls_before = count_polls(api)
+    updates = burst(api, first_id=1)
+    chats = [u["message"]["chat"]["id"] for u in updates if "message" in u]
+    started = time.perf_counter()
+    for update in updates:
+        api.push_update(update)
+    assert api.wait_for(chats[0], timeout=30)
+    first = time.perf_counter() - started
+    for chat_id in chats:
+        assert api.wait_for(chat_id, timeout=60), f"no reply for {chat_id}"
+    last = time.perf_counter() - started
+    polls = count_polls(api) - polls_before
+    stop()
+    return idle, first, last, polls
+
+
+def main():
+    idle_seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 30
+    api = FakeBotApi(latency=LATENCY).start()
+    apihelper.API_URL = api.api_url
+    print(f"idle window {idle_seconds:.0f}s, burst of {MESSAGES} messages + {NOISE} other updates, "
+          f"{LATENCY * 1000:.0f} ms per Bot API call")
+    print(f"{'polling':14}{'idle polls/min':>16}{'first reply s':>15}{'last reply s':>14}{'burst polls':>13}")
+    for label, start in (("old", start_old), ("Poller", start_new)):
+        idle, first, last, polls = measure(api, start, idle_seconds)
+        print(f"{label:14}{idle:>16.1f}{first:>15.3f}{last:>14.2f}{polls:>13}")
+    api.stop()
+
+
+if __name__ == "__main__":
+    main()
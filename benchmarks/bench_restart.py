@@ -0,0 +1,110 @@
+# ===============================================================
+# ری‌استارت بعد از کرش: آیا آپدیت‌ها دوباره اجرا می‌شن؟
+# ربات واقعی (python main.py در حالت polling) در برابر سرور محلی fake
+# Bot API اجرا می‌شه. هر کاربر تا یک منوی درس می‌ره و دو دکمه‌ی ارسال
+# فایل می‌زنه. بعد پروسه با SIGKILL کشته می‌شه و آخرین آپدیت‌ها دوباره در
+# صف گذاشته می‌شن (مثل دسته‌ای که تأییدش قبل از کرش به تلگرام نرسیده).
+# بعد از اجرای دوباره شمرده می‌شه چند ارسال تکراری انجام شد و اولین
+# getUpdates با چه offsetی فرستاده شد؛ یک بار با journal و یک بار بدون.
+# اجرا:  python benchmarks/bench_restart.py
+# ===============================================================
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+import requests  # noqa: E402
+
+from bench_workers import find_scenario, free_port, make_update  # noqa: E402
+from catalog import load_catalog  # noqa: E402
+from fake_bot_api import FakeBotApi  # noqa: E402
+
+USERS = 20
+REPLAYED = 20
+LATENCY = 0.01
+
+
+def start_bot(api, tmp, window):
+    port = free_port()
+    env = dict(os.environ, BOT_TOKEN="1:bench", BOT_API_URL=api.api_url, PORT=str(port),
+               STATE_DB=os.path.join(tmp, "states.db"), POLL_TIMEOUT="1",
+               UPDATE_DEDUPE_WINDOW=str(window), STATE_SAVE_INTERVAL="0.2",
+               RATE_LIMIT_GLOBAL="1000000", RATE_LIMIT_CHAT="1000000", ALBUM_DELIVERY="0")
+    env.pop("ENV", None)
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "main.py")], cwd=tmp, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(200):
+        try:
+            if requests.get(f"http://127.0.0.1:{port}", timeout=1).ok:
+                return proc
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("bot did not start")
+
+
+def run(api, window, texts, expected_calls):
+    api.reset()
+    api.updates.clear()
+    tmp = tempfile.mkdtemp()
+    proc = start_bot(api, tmp, window)
+
+    updates = []
+    for step, text in enumerate(texts):
+        for n in range(USERS):
+            updates.append(make_update(len(updates) + 1, 10000 + n, text))
+    for update in updates:
+        api.push_update(update)
+    for n in range(USERS):
+        assert api.wait_for(10000 + n, expected_calls, timeout=60), "first run incomplete"
+    # ذخیره‌ی دوره‌ای حالت کاربرها هم انجام بشه
+    time.sleep(1)
+    proc.kill()
+    proc.wait()
+    # getUpdates بازِ پروسه‌ی کشته‌شده (POLL_TIMEOUT=1) اول تموم بشه
+    time.sleep(1.5)
+    before = len(api.calls)
+
+    # تلگرام دسته‌ای که تأییدش نرسیده رو دوباره می‌فرسته
+    for update in updates[-REPLAYED:]:
+        api.push_update(update)
+    fresh = make_update(len(updates) + 1, 99999, "/start")
+    api.push_update(fresh)
+
+    started = time.perf_counter()
+    proc = start_bot(api, tmp, window)
+    assert api.wait_for(99999, timeout=30), "no reply after restart"
+    resumed = time.perf_counter() - started
+    time.sleep(1)
+    proc.kill()
+    proc.wait()
+
+    after = api.calls[before:]
+    first_poll = next(p for method, p in after if method == 'getUpdates')
+    duplicates = sum(1 for method, p in after if p.get('chat_id') is not None
+                     and str(p['chat_id']) != str(fresh["message"]["chat"]["id"]))
+    return first_poll.get('offset'), duplicates, resumed
+
+
+def main():
+    catalog = load_catalog(os.path.join(ROOT, "catalog.json"))
+    path, sends = find_scenario(catalog)
+    texts = ["/start"] + [text for text, _ in path] + [text for text, _ in sends]
+    expected_calls = len(texts) - len(sends) + sum(len(items) for _, items in sends)
+    api = FakeBotApi(latency=LATENCY).start()
+    print(f"{USERS} users x {len(texts)} updates, last {REPLAYED} updates redelivered after SIGKILL")
+    print(f"{'journal':10}{'first offset':>14}{'repeated sends':>16}{'restart to reply s':>20}")
+    for label, window in (("off", 0), ("on", 1000)):
+        offset, duplicates, resumed = run(api, window, texts, expected_calls)
+        print(f"{label:10}{str(offset):>14}{duplicates:>16}{resumed:>20.2f}")
+    api.stop()
+
+
+if __name__ == "__main__":
+    main()
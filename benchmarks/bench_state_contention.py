@@ -0,0 +1,85 @@
+# ===============================================================
+# بنچمارک دسترسی هم‌زمان به حالت کاربران: ۱ بخش (قفل سراسری) در برابر
+# چند بخش با قفل جدا، با تعداد threadهای مختلف.
+# هم‌زمان یک thread مدام flush می‌کنه و در آخر بررسی می‌شه که هیچ
+# تغییری گم نشده باشه.
+# اجرا:  python benchmarks/bench_state_contention.py
+# ===============================================================
+
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from state_store import StateStore  # noqa: E402
+
+OPS_PER_THREAD = 20000
+USERS_PER_THREAD = 500
+STATES = [f"STATE_{i}" for i in range(100)]
+
+
+def run(shards, threads):
+    path = os.path.join(tempfile.mkdtemp(), "states.db")
+    store = StateStore(path, capacity=100000, shards=shards)
+    store.intern_all(STATES)
+    expected = {}
+    stop = threading.Event()
+    waits = []
+
+    def worker(n):
+        rng = random.Random(n)
+        users = range(n * USERS_PER_THREAD + 1, (n + 1) * USERS_PER_THREAD + 1)
+        last = {}
+        for _ in range(OPS_PER_THREAD):
+            uid = rng.choice(users)
+            if rng.random() < 0.3:
+                state = rng.choice(STATES)
+                store[uid] = state
+                last[uid] = state
+            else:
+                store.get(uid)
+        expected.update(last)
+
+    def persister():
+        while not stop.is_set():
+            started = time.perf_counter()
+            store.flush()
+            waits.append(time.perf_counter() - started)
+            time.sleep(0.01)
+
+    flusher = threading.Thread(target=persister)
+    flusher.start()
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    started = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    flusher.join()
+    store.close()
+
+    # همه‌چیز باید از دیتابیس دوباره خونده بشه
+    check = StateStore(path)
+    lost = sum(1 for uid, state in expected.items() if check.get(uid) != state)
+    check.close()
+    assert lost == 0, f"{lost} updates lost"
+    return threads * OPS_PER_THREAD / elapsed
+
+
+def main():
+    print(f"{OPS_PER_THREAD} ops per thread (30% writes), flush every 10 ms")
+    print(f"{'threads':>8}{'1 shard ops/s':>16}{'16 shards ops/s':>18}")
+    for threads in (1, 2, 4, 8, 16):
+        single = run(1, threads)
+        sharded = run(16, threads)
+        print(f"{threads:>8}{single:>16.0f}{sharded:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# ===============================================================
+# بنچمارک حافظه و حجم ذخیره‌ی حالت کاربران به ازای ۱۰۰ هزار کاربر
+# قبل: dict[str, str] که از user_states.json خونده می‌شد
+# بعد: IntTable با شماره‌ی حالت‌ها + جدول INTEGER در SQLite
+# اجرا:  python benchmarks/bench_state_memory.py [users]
+# ===============================================================
+
+import gc
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from catalog import load_catalog  # noqa: E402
+from state_store import StateStore  # noqa: E402
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def file_size(path):
+    return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    catalog = load_catalog(os.path.join(ROOT, "catalog.json"))
+    names = list(catalog.nodes)
+    rng = random.Random(1)
+    # شناسه‌های واقعی تلگرام حدود ۱۰ رقمی هستن
+    states = {uid: rng.choice(names) for uid in rng.sample(range(10 ** 8, 7 * 10 ** 9), users)}
+    tmp = tempfile.mkdtemp()
+
+    # --- قبل ---
+    json_path = os.path.join(tmp, "user_states.json")
+    with open(json_path, "w") as f:
+        json.dump({str(uid): state for uid, state in states.items()}, f, ensure_ascii=False, indent=4)
+
+    def load_json():
+        with open(json_path) as f:
+            return json.load(f)
+    legacy, legacy_bytes = measure(load_json)
+    assert len(legacy) == users
+    del legacy
+
+    text_db = os.path.join(tmp, "text.db")
+    db = sqlite3.connect(text_db)
+    db.execute("CREATE TABLE user_states (user_id INTEGER PRIMARY KEY, state TEXT NOT NULL)")
+    db.executemany("INSERT INTO user_states VALUES (?, ?)", states.items())
+    db.commit()
+    db.close()
+
+    # --- بعد ---
+    db_path = os.path.join(tmp, "user_states.db")
+    store = StateStore(db_path, capacity=users)
+    store.intern_all(names)
+    items = list(states.items())
+
+    def fill():
+        for uid, state in items:
+            store[uid] = state
+        store.flush()
+        return store
+    _, store_bytes = measure(fill)
+    assert len(store) == users
+    store.close()
+
+    print(f"{users} users, {len(names)} distinct states")
+    print(f"{'':28}{'before':>12}{'after':>12}{'ratio':>8}")
+    rows = [
+        ("memory (tracemalloc)", legacy_bytes, store_bytes),
+        ("snapshot vs JSON file", os.path.getsize(json_path), file_size(db_path)),
+        ("snapshot vs TEXT SQLite", file_size(text_db), file_size(db_path)),
+    ]
+    for label, before, after in rows:
+        print(f"{label:28}{before / 1e6:>10.2f}MB{after / 1e6:>10.2f}MB{before / after:>7.1f}x")
+    print(f"memory per user: {legacy_bytes / users:.0f} B -> {store_bytes / users:.0f} B")
+
+
+if __name__ == "__main__":
+    main()
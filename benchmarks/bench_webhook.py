@@ -0,0 +1,105 @@
+# ===============================================================
+# بنچمارک تأخیر آپدیت تا پاسخ: polling در برابر webhook
+# هر حالت در یک پروسه‌ی جدا main رو import می‌کنه (تنظیمات از env خونده
+# می‌شه) و به سرور محلی fake Bot API وصل می‌شه. زمان از رسیدن آپدیت (در
+# صف getUpdates یا POST به /webhook) تا رسیدن sendMessage پاسخ اندازه
+# گرفته می‌شه. تأخیر شبکه‌ی بین تلگرام و سرور ما در حالت webhook شبیه‌سازی
+# نشده.
+# اجرا:  python benchmarks/bench_webhook.py
+# ===============================================================
+
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+SAMPLES = 40
+LATENCY = 0.02
+SECRET = "bench-secret"
+
+
+def make_update(update_id, chat_id):
+    return {"update_id": update_id, "message": {
+        "message_id": update_id, "date": int(time.time()), "text": "/start",
+        "chat": {"id": chat_id, "type": "private"},
+        "from": {"id": chat_id, "is_bot": False, "first_name": "bench"}}}
+
+
+def child(mode):
+    import requests
+    from telebot import apihelper
+    from werkzeug.serving import make_server
+
+    from fake_bot_api import FakeBotApi
+
+    api = FakeBotApi(latency=LATENCY).start()
+    apihelper.API_URL = api.api_url
+    os.chdir(tempfile.mkdtemp())
+    import main
+    main.start_background()
+
+    if mode == "polling":
+        threading.Thread(target=main.poller.run, args=(main.bot,), daemon=True).start()
+    else:
+        server = make_server("127.0.0.1", 0, main.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}{main.WEBHOOK_PATH}"
+        session = requests.Session()
+        bad = session.post(url, json=make_update(1, 1), headers={"X-Telegram-Bot-Api-Secret-Token": "wrong"})
+        assert bad.status_code == 403, bad.status_code
+        time.sleep(0.2)
+
+    rng = random.Random(1)
+    latencies = []
+    started = time.perf_counter()
+    for i in range(SAMPLES):
+        chat_id = 1000 + i
+        update = make_update(10 + i, chat_id)
+        sent = time.perf_counter()
+        if mode == "polling":
+            api.push_update(update)
+        else:
+            session.post(url, json=update, headers={"X-Telegram-Bot-Api-Secret-Token": SECRET})
+        assert api.wait_for(chat_id), f"no reply for chat {chat_id}"
+        latencies.append(time.perf_counter() - sent)
+        # فاصله‌ی تصادفی تا آپدیت‌ها در لحظه‌های مختلف چرخه‌ی polling برسن
+        time.sleep(rng.uniform(0.05, 0.5))
+    elapsed = time.perf_counter() - started
+    polls = sum(1 for method, _ in api.calls if method == "getUpdates")
+    print(json.dumps({"latencies": latencies, "polls_per_min": polls / elapsed * 60}))
+
+
+def run(mode):
+    env = dict(os.environ, BOT_TOKEN="1:bench", UPDATE_MODE=mode,
+               WEBHOOK_URL="https://bench.invalid", WEBHOOK_SECRET=SECRET,
+               RATE_LIMIT_GLOBAL="1000")
+    out = subprocess.run([sys.executable, __file__, "--child", mode], env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    print(f"{SAMPLES} updates per mode, {LATENCY * 1000:.0f} ms per Bot API call")
+    print(f"{'mode':10}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'getUpdates/min':>16}")
+    for mode in ("polling", "webhook"):
+        result = run(mode)
+        ms = sorted(x * 1000 for x in result["latencies"])
+        p95 = ms[int(len(ms) * 0.95) - 1]
+        print(f"{mode:10}{statistics.median(ms):>9.1f}{p95:>9.1f}{ms[-1]:>9.1f}"
+              f"{result['polls_per_min']:>16.1f}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        child(sys.argv[2])
+    else:
+        main()
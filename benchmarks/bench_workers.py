@@ -0,0 +1,146 @@
+# ===============================================================
+# بنچمارک توان پردازش webhook با ۱، ۲، ۴ و ۸ worker گانیکورن
+# ربات واقعی (python main.py با ENV=production) در برابر سرور محلی fake
+# Bot API اجرا می‌شه. هر کاربر مثل تلگرام آپدیت‌هاش رو پشت‌سرهم می‌فرسته
+# (آپدیت بعدی بعد از جواب قبلی) و کاربرهای مختلف هم‌زمان.
+# برای هر چت بررسی می‌شه که پاسخ منوها و فایل‌های دو ارسال پشت‌سرهم با
+# همون ترتیب رسیده باشن، حتی وقتی ارسال‌ها بین workerها پخش شدن.
+# اجرا:  python benchmarks/bench_workers.py   (gunicorn لازمه)
+# ===============================================================
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+import requests  # noqa: E402
+
+from catalog import SEND, load_catalog  # noqa: E402
+from fake_bot_api import FakeBotApi  # noqa: E402
+
+USERS = 48
+CLIENTS = 32
+LATENCY = 0.02
+SECRET = "bench-secret"
+
+
+def find_scenario(catalog):
+    # اولین منویی که حداقل دو دکمه‌ی ارسال داره و مسیر رسیدن بهش
+    parents = {}
+    queue = [catalog.root]
+    for text, node_id in catalog.global_routes.items():
+        parents.setdefault(node_id, (catalog.root.id, text))
+    while queue:
+        node = queue.pop(0)
+        sends = [(text, action[1]) for text, action in node.actions.items() if action[0] == SEND]
+        if len(sends) >= 2:
+            path = []
+            node_id = node.id
+            while node_id != catalog.root.id:
+                parent, text = parents[node_id]
+                path.append((text, node_id))
+                node_id = parent
+            return list(reversed(path)), sends[:2]
+        children = [(t, a[1]) for t, a in node.actions.items() if a[0] != SEND]
+        children += [(t, n) for t, n in catalog.global_routes.items() if node is catalog.root]
+        for text, child in children:
+            if child not in parents or parents[child][0] == node.id:
+                parents.setdefault(child, (node.id, text))
+                if parents[child][0] == node.id:
+                    queue.append(catalog.node(child))
+    raise RuntimeError("no menu with two send buttons")
+
+
+def make_update(update_id, chat_id, text):
+    return {"update_id": update_id, "message": {
+        "message_id": update_id, "date": int(time.time()), "text": text,
+        "chat": {"id": chat_id, "type": "private"},
+        "from": {"id": chat_id, "is_bot": False, "first_name": "bench"}}}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_bot(api, workers, tmp):
+    port = free_port()
+    env = dict(os.environ, ENV="production", UPDATE_MODE="webhook", PORT=str(port),
+               WEB_WORKERS=str(workers), WEB_THREADS="8", BOT_TOKEN="1:bench",
+               BOT_API_URL=api.api_url, WEBHOOK_URL="https://bench.invalid",
+               WEBHOOK_SECRET=SECRET, STATE_DB=os.path.join(tmp, "states.db"),
+               RATE_LIMIT_GLOBAL="1000000", RATE_LIMIT_CHAT="1000000", ALBUM_DELIVERY="0")
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "main.py")], cwd=tmp, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(200):
+        try:
+            if requests.get(url, timeout=1).ok:
+                return proc, url + "/webhook"
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("bot did not start")
+
+
+def run(api, workers, path, sends):
+    api.reset()
+    tmp = tempfile.mkdtemp()
+    proc, url = start_bot(api, workers, tmp)
+    texts = ["/start"] + [text for text, _ in path] + [text for text, _ in sends]
+    menus = len(texts) - len(sends)
+    files = [item for _, items in sends for item in items]
+
+    def user(n):
+        chat_id = 10000 + n
+        session = requests.Session()
+        for i, text in enumerate(texts):
+            update = make_update(n * 100 + i + 1, chat_id, text)
+            r = session.post(url, json=update, headers={"X-Telegram-Bot-Api-Secret-Token": SECRET})
+            assert r.ok, r.status_code
+        assert api.wait_for(chat_id, menus + len(files), timeout=60), f"chat {chat_id} incomplete"
+        return chat_id
+
+    try:
+        api.calls.clear()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(CLIENTS) as pool:
+            chats = list(pool.map(user, range(USERS)))
+        elapsed = time.perf_counter() - started
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    expected = [value for _, value, _ in files]
+    for chat_id in chats:
+        calls = api.by_chat[str(chat_id)]
+        delivered = [p.get('text') or p.get('document') or p.get('video') or p.get('audio')
+                     or p.get('photo') or p.get('voice') for _, p in calls if 'reply_markup' not in p]
+        assert delivered == expected, f"chat {chat_id} deliveries out of order"
+        assert sum(1 for _, p in calls if 'reply_markup' in p) == menus
+    return USERS * len(texts) / elapsed, len(api.calls) / elapsed
+
+
+def main():
+    catalog = load_catalog(os.path.join(ROOT, "catalog.json"))
+    path, sends = find_scenario(catalog)
+    api = FakeBotApi(latency=LATENCY).start()
+    print(f"{USERS} users x {1 + len(path) + len(sends)} updates, {CLIENTS} concurrent clients, "
+          f"{LATENCY * 1000:.0f} ms per Bot API call, {os.cpu_count()} CPU(s)")
+    print(f"{'workers':>8}{'updates/s':>12}{'API calls/s':>14}")
+    for workers in (1, 2, 4, 8):
+        updates, calls = run(api, workers, path, sends)
+        print(f"{workers:>8}{updates:>12.1f}{calls:>14.1f}")
+    api.stop()
+
+
+if __name__ == "__main__":
+    main()
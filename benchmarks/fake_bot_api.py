@@ -0,0 +1,161 @@
+# ===============================================================
+# سرور محلی شبیه Bot API تلگرام برای بنچمارک‌ها 🧪
+# ===============================================================
+# هر متدی رو قبول می‌کنه، با تأخیر قابل تنظیم جواب می‌ده و ترتیب
+# درخواست‌های هر چت رو نگه می‌داره تا بشه ترتیب تحویل رو بررسی کرد.
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeBotApi:
+    def __init__(self, latency=0.02, host='127.0.0.1', port=0):
+        self.latency = latency
+        self.calls = []
+        self.by_chat = {}
+        self.updates = []
+        self.broken_file_ids = set()
+        self._lock = threading.Lock()
+        # getUpdates مثل تلگرام تا timeout ثانیه منتظر آپدیت جدید می‌مونه
+        self._changed = threading.Condition(self._lock)
+        self._message_id = 0
+        # بیشترین تعداد درخواست هم‌زمان (برای مقایسه‌ی موتورها)
+        self.inflight = 0
+        self.max_inflight = 0
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self):
+        # قالب apihelper.API_URL
+        return self.url + "/bot{0}/{1}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+            self.by_chat.clear()
+            self.max_inflight = 0
+
+    def push_update(self, update):
+        with self._lock:
+            self.updates.append(update)
+            self._changed.notify_all()
+
+    def wait_for(self, chat_id, count=1, timeout=10):
+        # صبر تا count درخواست برای این چت برسه
+        with self._lock:
+            return self._changed.wait_for(
+                lambda: len(self.by_chat.get(str(chat_id), ())) >= count, timeout)
+
+    def _next_message(self, chat_id, text=None):
+        self._message_id += 1
+        message = {"message_id": self._message_id, "date": int(time.time()),
+                   "chat": {"id": int(chat_id or 0), "type": "private"}}
+        if text is not None:
+            message["text"] = text
+        return message
+
+    def handle(self, method, params):
+        chat_id = params.get('chat_id')
+        with self._lock:
+            self.calls.append((method, params))
+            if chat_id is not None:
+                self.by_chat.setdefault(str(chat_id), []).append((method, params))
+                self._changed.notify_all()
+
+            if method == 'getUpdates':
+                offset = int(params.get('offset', 0) or 0)
+                limit = int(params.get('limit', 100) or 100)
+                timeout = float(params.get('timeout', 0) or 0)
+                allowed = params.get('allowed_updates')
+                if isinstance(allowed, str):
+                    allowed = json.loads(allowed)
+
+                def wanted(u):
+                    # مثل تلگرام، نوع‌هایی که خواسته نشدن اصلاً تحویل داده نمی‌شن
+                    return u['update_id'] >= offset and (not allowed or any(k in u for k in allowed))
+                self._changed.wait_for(lambda: any(wanted(u) for u in self.updates), timeout)
+                self.updates = [u for u in self.updates if wanted(u)]
+                return 200, self.updates[:limit]
+            if method == 'getMe':
+                return 200, {"id": 1, "is_bot": True, "first_name": "fake", "username": "fake_bot"}
+            if method == 'getFile':
+                file_id = params.get('file_id')
+                if file_id in self.broken_file_ids:
+                    return 400, "Bad Request: invalid file_id"
+                return 200, {"file_id": file_id, "file_unique_id": "u" + file_id[-8:],
+                             "file_size": 1024, "file_path": f"documents/{file_id[-8:]}"}
+            if method == 'sendMediaGroup':
+                media = json.loads(params.get('media', '[]'))
+                return 200, [self._next_message(chat_id) for _ in media]
+            if method == 'copyMessages':
+                ids = json.loads(params.get('message_ids', '[]'))
+                return 200, [{"message_id": self._next_message(chat_id)["message_id"]} for _ in ids]
+            if method in ('setWebhook', 'deleteWebhook'):
+                return 200, True
+            return 200, self._next_message(chat_id, params.get('text'))
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                self._serve()
+
+            def do_POST(self):
+                self._serve()
+
+            def _serve(self):
+                parsed = urlparse(self.path)
+                method = parsed.path.rsplit('/', 1)[-1]
+                params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    body = self.rfile.read(length)
+                    if self.headers.get('Content-Type', '').startswith('application/json'):
+                        params.update(json.loads(body or b'{}'))
+                    else:
+                        params.update({k: v[0] for k, v in parse_qs(body.decode()).items()})
+                with api._lock:
+                    api.inflight += 1
+                    api.max_inflight = max(api.max_inflight, api.inflight)
+                if api.latency:
+                    time.sleep(api.latency)
+                status, result = api.handle(method, params)
+                with api._lock:
+                    api.inflight -= 1
+                if status == 200:
+                    payload = {"ok": True, "result": result}
+                else:
+                    payload = {"ok": False, "error_code": status, "description": result}
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
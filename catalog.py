@@ -0,0 +1,411 @@
+# ===============================================================
+# کاتالوگ درس‌ها: فایل داده ← گراف منوها 📚
+# ===============================================================
+# کل درخت ترم ← درس ← استاد ← نوع منبع ← جلسه ← فایل‌ها در catalog.json
+# نوشته شده و موقع بالا آمدن ربات یک بار به گرافی از Nodeها تبدیل می‌شه.
+# هر دکمه یکی از این کارها رو انجام می‌ده:
+#   id + buttons  → ورود به یک منوی جدید (تعریف منو همون‌جا)
+#   goto          → ورود به منویی که جای دیگه تعریف شده
+#   back: true    → برگشت به منوی قبلی (از روی پشته‌ی ناوبری کاربر)
+#   back: "<id>"  → برگشت به یک منوی مشخص
+#   send          → ارسال پیام‌ها و فایل‌ها به ترتیب (هر آیتم فایل می‌تونه
+#                   file_unique_id هم داشته باشه تا نسخه‌های دیگه‌ی همون
+#                   فایل شناخته بشن)
+#   copy          → کپی پیام‌های [اول، آخر] کانال ذخیره (storage_chat ریشه‌ی
+#                   catalog.json) با copy_messages؛ به شکل آیتم در send هم میاد
+# دکمه‌ای که global باشه از هر حالتی کار می‌کنه.
+#
+# هر کاربر یک مسیر (پشته) از منوها داره، مثلاً (HOME, TERM_1, oloomtash_1)؛
+# ورود به منو روی پشته می‌ره و «بازگشت» یکی برمی‌داره. برای همین همه‌ی
+# دکمه‌های back: true با یک مسیر سراسری به ازای هر متن کار می‌کنن.
+
+import json
+import sys
+import time
+
+GOTO = 'goto'
+BACK = 'back'
+SEND = 'send'
+
+# آیتم‌هایی که file_id دارن
+FILE_KINDS = ('document', 'video', 'voice', 'photo', 'audio')
+ITEM_KINDS = ('message', 'copy') + FILE_KINDS
+
+# عمق حداکثر پشته‌ی ناوبری؛ قدیمی‌ترها از ته پشته حذف می‌شن
+NAV_DEPTH = 16
+
+
+class CatalogError(ValueError):
+    pass
+
+
+def keyboard_json(buttons, row_width):
+    # همون خروجی ReplyKeyboardMarkup(resize_keyboard=True).to_json() در telebot
+    rows = [[{'text': b} for b in buttons[i:i + row_width]]
+            for i in range(0, len(buttons), row_width)]
+    return json.dumps({'keyboard': rows, 'resize_keyboard': True})
+
+
+class FileMeta:
+    # مشخصات یک فایل تلگرام؛ برای فایل‌های /get_ids از خود پیام پر می‌شه،
+    # برای فایل‌های catalog.json فقط نوع و file_id معلومه
+    __slots__ = ('kind', 'file_id', 'file_unique_id', 'file_name', 'file_size', 'duration', 'mime_type')
+
+    def __init__(self, kind, file_id, file_unique_id, file_name=None, file_size=None,
+                 duration=None, mime_type=None):
+        self.kind = kind
+        self.file_id = file_id
+        self.file_unique_id = file_unique_id
+        self.file_name = file_name
+        self.file_size = file_size
+        self.duration = duration
+        self.mime_type = mime_type
+
+    @classmethod
+    def from_message(cls, message):
+        kind = message.content_type
+        if kind == 'photo':
+            # بزرگ‌ترین اندازه‌ی عکس
+            media = message.photo[-1]
+        elif kind in ('document', 'video', 'audio', 'voice'):
+            media = getattr(message, kind)
+        else:
+            return None
+        return cls(kind, media.file_id, media.file_unique_id,
+                   file_name=getattr(media, 'file_name', None),
+                   file_size=getattr(media, 'file_size', None),
+                   duration=getattr(media, 'duration', None),
+                   mime_type=getattr(media, 'mime_type', None))
+
+    def merge(self, other):
+        # مشخصاتی که این نسخه نداره از نسخه‌ی دیگه‌ی همون فایل
+        for name in self.__slots__:
+            if getattr(self, name) is None:
+                setattr(self, name, getattr(other, name))
+
+    def __repr__(self):
+        return f"FileMeta({self.kind!r}, {self.file_unique_id!r})"
+
+
+class FileIndex:
+    # هر فایل واقعی فقط یک بار نگه داشته می‌شه. تلگرام برای یک فایل ممکنه
+    # file_idهای مختلفی بده (مثلاً اگه دوباره آپلود یا فوروارد بشه)، ولی
+    # file_unique_id همیشه یکیه؛ همه‌ی file_idهای دیده‌شده به یک FileMeta
+    # اشاره می‌کنن و آیتم‌های منوها file_id اصلی اون رو (به شکل یک رشته‌ی
+    # مشترک، نه یک کپی برای هر منو) می‌گیرن. فایل‌های catalog.json تا وقتی
+    # file_unique_id شون معلوم نشه (از /get_ids یا getFile) FileMeta ندارن
+    # و با خود file_id شناخته می‌شن.
+    def __init__(self):
+        # file_unique_id -> FileMeta
+        self.by_unique = {}
+        # هر file_id شناخته‌شده -> FileMeta اصلی همون فایل
+        self.by_file_id = {}
+
+    def add(self, meta):
+        # FileMeta اصلی این فایل رو برمی‌گردونه (اگه قبلاً دیده شده، همون قبلی)
+        known = self.by_unique.get(meta.file_unique_id)
+        alias = self.by_file_id.get(meta.file_id)
+        if known is None:
+            known = alias or meta
+        elif alias is not None and alias is not known:
+            # دو فایل جدا که حالا معلوم شد یکی‌ان
+            known.merge(alias)
+            for file_id, target in self.by_file_id.items():
+                if target is alias:
+                    self.by_file_id[file_id] = known
+        if known is not meta:
+            known.merge(meta)
+        self.by_unique[known.file_unique_id] = known
+        self.by_file_id.setdefault(known.file_id, known)
+        self.by_file_id[meta.file_id] = known
+        return known
+
+    def get(self, file_id=None, file_unique_id=None):
+        if file_unique_id is not None:
+            return self.by_unique.get(file_unique_id)
+        return self.by_file_id.get(file_id)
+
+    def item(self, kind, value, caption=None):
+        # آیتم منو با file_id اصلی فایل
+        meta = self.by_file_id.get(value) if kind in FILE_KINDS else None
+        # file_id یک نوع دیگه (مثلاً ویدیویی که به شکل document فرستاده شده)
+        # با متد این نوع فرستاده نمی‌شه
+        if meta is not None and meta.kind == kind:
+            value = meta.file_id
+        return (kind, sys.intern(value), caption)
+
+    def unique(self, items):
+        # هر فایل واقعی یک بار (فایل‌های بدون مشخصات با یک FileMeta موقت)
+        files = {}
+        for kind, value, _ in items:
+            if kind in FILE_KINDS:
+                meta = self.by_file_id.get(value)
+                if meta is None:
+                    files.setdefault(value, FileMeta(kind, value, None))
+                else:
+                    files.setdefault(id(meta), meta)
+        return list(files.values())
+
+
+class Node:
+    __slots__ = ('id', 'text', 'row_width', 'buttons', 'parent', 'actions', 'markup')
+
+    def __init__(self, node_id, text, row_width, parent):
+        self.id = node_id
+        self.text = text
+        self.row_width = row_width
+        self.parent = parent
+        self.buttons = []
+        self.actions = {}
+        self.markup = None
+
+    def rebuild_markup(self):
+        # کیبورد هر منو یک بار ساخته و JSON می‌شه و همون رشته برای همه‌ی
+        # ارسال‌ها استفاده می‌شه؛ فقط وقتی دکمه‌ها عوض بشن دوباره ساخته می‌شه
+        self.markup = keyboard_json(self.buttons, self.row_width)
+        return self.markup
+
+    def __repr__(self):
+        return f"Node({self.id!r})"
+
+
+class Catalog:
+    def __init__(self, root, nodes, global_routes, back_texts=(), files=None):
+        self.root = root
+        self.nodes = nodes
+        self.global_routes = global_routes
+        self.back_texts = set(back_texts)
+        # همه‌ی فایل‌های منوها، هر فایل واقعی یک بار
+        self.files = files if files is not None else FileIndex()
+
+    def node(self, node_id):
+        return self.nodes.get(node_id)
+
+    # --- پشته‌ی ناوبری ---
+
+    def tree_path(self, node_id):
+        # مسیر از ریشه تا این منو در درخت catalog.json
+        path = []
+        node = self.nodes.get(node_id)
+        while node is not None:
+            path.append(node.id)
+            node = self.nodes.get(node.parent)
+        return tuple(reversed(path)) or (self.root.id,)
+
+    def enter(self, path, node_id):
+        # اگه منو قبلاً در مسیر بوده تا همون‌جا برمی‌گردیم، وگرنه روی پشته می‌ره
+        path = tuple(p for p in path if p in self.nodes)
+        if node_id in path:
+            return path[:path.index(node_id) + 1]
+        if not path:
+            return self.tree_path(node_id)
+        return (path + (node_id,))[-NAV_DEPTH:]
+
+    def leave(self, path):
+        # مسیر بعد از «بازگشت»؛ اگه تاریخچه‌ای نباشه (مثلاً حالت‌های قدیمی
+        # بدون پشته) به والد همین منو در درخت می‌ریم
+        path = tuple(p for p in path if p in self.nodes)
+        if len(path) > 1:
+            return path[:-1]
+        parent = self.nodes[path[0]].parent if path else None
+        if parent is None:
+            return (self.root.id,)
+        return self.tree_path(parent)
+
+    def step(self, path, text):
+        # همون کاری که هندلرها با یک دکمه می‌کنن، بدون ارسال پیام:
+        # (مسیر جدید، آیتم‌های ارسال یا None)
+        node = self.nodes.get(path[-1]) if path else None
+        action = node.actions.get(text) if node is not None else None
+        if action is not None:
+            if action[0] == SEND:
+                return path, action[1]
+            return self.enter(path, action[1]), None
+        if text in self.global_routes:
+            return self.tree_path(self.global_routes[text]), None
+        if text in self.back_texts:
+            return self.leave(path), None
+        return path, None
+
+    def knows(self, text):
+        # دکمه‌ای که step (در منوی مناسبش) می‌شناسه
+        return (text in self.global_routes or text in self.back_texts
+                or any(text in node.actions for node in self.nodes.values()))
+
+    # --- اضافه کردن محتوا بدون ری‌استارت ---
+
+    def check_button(self, node_id, text):
+        node = self.nodes.get(node_id)
+        if node is None:
+            raise CatalogError(f"منوی {node_id!r} وجود نداره")
+        if not text:
+            raise CatalogError(f"{node_id}: دکمه بدون متن")
+        if text in node.actions or text in self.back_texts or text in self.global_routes:
+            raise CatalogError(f"{node_id}: دکمه‌ی «{text}» از قبل وجود داره")
+        return node
+
+    def add_button(self, node_id, text, items):
+        # دکمه‌ی ارسال جدید ته منو؛ اگه دکمه‌ی «به‌زودی» با همین متن باشه
+        # همون دکمه فعال می‌شه. همون قوانین catalog.json بررسی می‌شن
+        if not items:
+            raise CatalogError(f"{node_id}: دکمه‌ی «{text}» فایلی نداره")
+        node = self.check_button(node_id, text)
+        action = (SEND, tuple(self.files.item(*item) for item in items))
+        node.actions[text] = action
+        if text not in node.buttons:
+            # قبل از دکمه‌های «بازگشت» ته منو
+            position = len(node.buttons)
+            while position and node.buttons[position - 1] in self.back_texts:
+                position -= 1
+            node.buttons.insert(position, text)
+        node.rebuild_markup()
+        return action
+
+    def send_items(self):
+        # همه‌ی آیتم‌های ارسالی همه‌ی منوها (هر دکمه یک بار)
+        for node in self.nodes.values():
+            for kind, target in node.actions.values():
+                if kind == SEND:
+                    yield from target
+
+    def unique_files(self):
+        return self.files.unique(self.send_items())
+
+    def file_mentions(self):
+        # file_id -> [(منو، دکمه), ...] برای گزارش‌ها
+        mentions = {}
+        for node in self.nodes.values():
+            for text, (kind, target) in node.actions.items():
+                if kind == SEND:
+                    for item_kind, value, _ in target:
+                        if item_kind in FILE_KINDS:
+                            mentions.setdefault(value, []).append((node.id, text))
+        return mentions
+
+    def invalidate(self, node_id=None):
+        targets = self.nodes.values() if node_id is None else [self.nodes[node_id]]
+        for node in targets:
+            node.rebuild_markup()
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+def _copy_range(value, where, storage_chat):
+    # [اول، آخر] یا یک شماره پیام ← "storage_chat:اول-آخر"
+    if storage_chat is None:
+        raise CatalogError(f"{where}: برای copy باید storage_chat در ریشه‌ی catalog.json تنظیم بشه")
+    if isinstance(value, int):
+        value = [value, value]
+    if (not isinstance(value, list) or len(value) != 2
+            or not all(isinstance(n, int) and n > 0 for n in value) or value[0] > value[1]):
+        raise CatalogError(f"{where}: copy باید [اولین، آخرین] شماره‌ی پیام باشه")
+    return f"{storage_chat}:{value[0]}-{value[1]}"
+
+
+def _compile_item(raw, where, files, storage_chat=None):
+    kinds = [k for k in ITEM_KINDS if k in raw]
+    if len(kinds) != 1:
+        raise CatalogError(f"{where}: هر آیتم باید دقیقاً یکی از {ITEM_KINDS} رو داشته باشه")
+    kind = kinds[0]
+    value = raw[kind]
+    if kind == 'copy':
+        # کپشن‌ها همون کپشن پیام‌های کانال‌ان
+        if raw.get('caption') is not None:
+            raise CatalogError(f"{where}: آیتم copy کپشن جدا نمی‌گیره")
+        return files.item(kind, _copy_range(value, where, storage_chat))
+    if not isinstance(value, str) or not value:
+        raise CatalogError(f"{where}: مقدار {kind} خالیه")
+    if raw.get('file_unique_id') and kind in FILE_KINDS:
+        files.add(FileMeta(kind, value, raw['file_unique_id']))
+    return files.item(kind, value, raw.get('caption'))
+
+
+def compile_catalog(data, files=None):
+    # files: یک FileIndex با فایل‌های از قبل شناخته‌شده (مثلاً از بررسی file_idها)
+    nodes = {}
+    global_routes = {}
+    back_texts = set()
+    links = []
+    if files is None:
+        files = FileIndex()
+    storage_chat = data.get('storage_chat')
+
+    def add_global(text, node_id, where):
+        if global_routes.setdefault(text, node_id) != node_id:
+            raise CatalogError(f"{where}: دکمه‌ی سراسری «{text}» دو مقصد مختلف داره")
+
+    def walk(raw, parent, where):
+        node_id = raw.get('id')
+        if not node_id:
+            raise CatalogError(f"{where}: منو بدون id")
+        if node_id in nodes:
+            raise CatalogError(f"{where}: id تکراری {node_id!r}")
+        node = Node(node_id, raw.get('text', ''), raw.get('row_width', 2), parent)
+        nodes[node_id] = node
+
+        for index, button in enumerate(raw.get('buttons', [])):
+            text = button.get('button')
+            here = f"{node_id}[{index}]"
+            if not text:
+                raise CatalogError(f"{here}: دکمه بدون متن")
+            node.buttons.append(text)
+
+            if 'id' in button:
+                walk(button, node_id, here)
+                action = (GOTO, button['id'])
+            elif 'goto' in button:
+                action = (GOTO, button['goto'])
+                links.append((button['goto'], here))
+            elif button.get('back') is True:
+                # همه‌ی «بازگشت به منوی قبلی»ها یک مسیر سراسری مشترک دارن
+                back_texts.add(text)
+                continue
+            elif 'back' in button:
+                action = (BACK, button['back'])
+                links.append((button['back'], here))
+            elif 'send' in button:
+                items = tuple(_compile_item(item, here, files, storage_chat) for item in button['send'])
+                if not items:
+                    raise CatalogError(f"{here}: لیست send خالیه")
+                action = (SEND, items)
+            elif 'copy' in button:
+                action = (SEND, (_compile_item({'copy': button['copy']}, here, files, storage_chat),))
+            else:
+                # دکمه‌ی «به‌زودی»: فقط نمایش داده می‌شه
+                continue
+
+            if button.get('global'):
+                if action[0] != GOTO:
+                    raise CatalogError(f"{here}: فقط دکمه‌های منو می‌تونن global باشن")
+                add_global(text, action[1], here)
+            elif node.actions.setdefault(text, action) != action:
+                raise CatalogError(f"{here}: دکمه‌ی تکراری «{text}»")
+        return node
+
+    root = walk(data, None, 'root')
+    for node in nodes.values():
+        node.rebuild_markup()
+
+    for target, where in links:
+        if target not in nodes:
+            raise CatalogError(f"{where}: مقصد ناموجود {target!r}")
+
+    for node in nodes.values():
+        clash = back_texts.intersection(node.actions)
+        if clash:
+            raise CatalogError(f"{node.id}: «{clash.pop()}» هم دکمه‌ی بازگشته هم کار دیگه‌ای داره")
+
+    return Catalog(root, nodes, global_routes, back_texts, files)
+
+
+def load_catalog(path, files=None):
+    started = time.perf_counter()
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    catalog = compile_catalog(data, files)
+    elapsed = (time.perf_counter() - started) * 1000
+    mentions = sum(1 for kind, _, _ in catalog.send_items() if kind in FILE_KINDS)
+    print(f"Catalog loaded: {len(catalog)} menus, {len(catalog.unique_files())} files "
+          f"({mentions} mentions) in {elapsed:.1f} ms")
+    return catalog
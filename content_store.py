@@ -0,0 +1,192 @@
+# ===============================================================
+# محتوای اضافه‌شده از طریق /get_ids 📥
+# ===============================================================
+# فایل‌هایی که ادمین می‌فرسته با مشخصاتشون (file_id، file_unique_id، نوع،
+# اسم فایل، حجم، مدت) و دکمه‌ای که بهشون اشاره می‌کنه در SQLite نوشته
+# می‌شن؛ همه در یک تراکنش، پس یا کل دکمه ثبت می‌شه یا هیچ‌چیز.
+# موقع بالا آمدن ربات (و در حالت چند worker هر چند ثانیه) دکمه‌ها روی
+# catalog.json اعمال می‌شن؛ پس محتوای جدید بدون deploy دوباره در دسترسه.
+# هر فایل واقعی (یک file_unique_id) فقط یک سطر در content_files داره و
+# دکمه‌هایی که همون فایل رو دارن به همون سطر اشاره می‌کنن؛ آپلود دوباره‌ی
+# یک فایل سطر جدیدی نمی‌سازه و file_id اولی نگه داشته می‌شه.
+# خود آپلودهای /get_ids هم (تا «پایان دریافت» و بعد تا /attach) در
+# upload_files نگه داشته می‌شن، نه در حافظه‌ی یک پروسه؛ پس با چند worker
+# گانیکورن فرقی نمی‌کنه هر پیام ادمین به کدوم worker برسه. آلبوم‌ها (گروه‌های
+# مدیا) هم در media_groups شمرده می‌شن تا پیام «گروه مدیا دریافت شد» حتی اگه
+# عکس‌های یک آلبوم بین workerها پخش بشن فقط یک بار فرستاده بشه.
+
+import time
+
+from catalog import FileMeta
+from db import ThreadConnections, connect, transaction
+
+FILE_COLUMNS = ('kind', 'file_id', 'file_unique_id', 'file_name', 'file_size', 'duration', 'mime_type')
+
+
+class ContentStore:
+    def __init__(self, path, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self._db = ThreadConnections(path)
+        db = connect(path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS content_files ("
+            "id INTEGER PRIMARY KEY, kind TEXT NOT NULL, file_id TEXT NOT NULL, "
+            "file_unique_id TEXT NOT NULL, file_name TEXT, file_size INTEGER, "
+            "duration INTEGER, mime_type TEXT, added REAL NOT NULL)")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS content_buttons ("
+            "id INTEGER PRIMARY KEY, node_id TEXT NOT NULL, button TEXT NOT NULL, "
+            "added REAL NOT NULL, UNIQUE (node_id, button))")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS content_items ("
+            "button INTEGER NOT NULL REFERENCES content_buttons (id), position INTEGER NOT NULL, "
+            "file INTEGER NOT NULL REFERENCES content_files (id), caption TEXT, "
+            "PRIMARY KEY (button, position))")
+        # چت‌هایی که /get_ids زدن و فایل‌هاشون: ready=0 هنوز در حال دریافت
+        # (به ترتیب message_id)، ready=1 آماده‌ی /attach (به ترتیب position)
+        db.execute("CREATE TABLE IF NOT EXISTS upload_sessions (chat_id INTEGER PRIMARY KEY, started REAL NOT NULL)")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS upload_files ("
+            "id INTEGER PRIMARY KEY, chat_id INTEGER NOT NULL, ready INTEGER NOT NULL, "
+            "position INTEGER NOT NULL, kind TEXT NOT NULL, file_id TEXT NOT NULL, "
+            "file_unique_id TEXT NOT NULL, file_name TEXT, file_size INTEGER, duration INTEGER, "
+            "mime_type TEXT, caption TEXT)")
+        db.execute("CREATE INDEX IF NOT EXISTS upload_files_chat ON upload_files (chat_id, ready, position)")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS media_groups ("
+            "group_id TEXT PRIMARY KEY, chat_id INTEGER NOT NULL, size INTEGER NOT NULL, "
+            "started REAL NOT NULL, last REAL NOT NULL)")
+        self._dedupe_files(db)
+        db.close()
+
+    @staticmethod
+    def _dedupe_files(db):
+        # دیتابیس‌های قبلی برای هر آپلود یک سطر داشتن؛ آیتم‌ها به سطر اولِ هر
+        # file_unique_id منتقل و بقیه پاک می‌شن، بعد ایندکس یکتا ساخته می‌شه
+        with transaction(db):
+            db.execute(
+                "UPDATE content_items SET file = (SELECT MIN(f2.id) FROM content_files AS f1 "
+                "JOIN content_files AS f2 ON f2.file_unique_id = f1.file_unique_id "
+                "WHERE f1.id = content_items.file)")
+            db.execute(
+                "DELETE FROM content_files WHERE id NOT IN "
+                "(SELECT MIN(id) FROM content_files GROUP BY file_unique_id)")
+            db.execute("CREATE UNIQUE INDEX IF NOT EXISTS content_files_unique "
+                       "ON content_files (file_unique_id)")
+
+    def add_button(self, node_id, button, files):
+        # files: لیست (FileMeta, caption) به ترتیب ارسال؛ id دکمه‌ی جدید برمی‌گرده
+        db = self._db()
+        now = self.clock()
+        with transaction(db):
+            button_id = db.execute(
+                "INSERT INTO content_buttons (node_id, button, added) VALUES (?, ?, ?)",
+                (node_id, button, now)).lastrowid
+            for position, (meta, caption) in enumerate(files):
+                # فایل تکراری فقط مشخصات خالی سطر قبلی رو پر می‌کنه
+                file_id = db.execute(
+                    f"INSERT INTO content_files ({', '.join(FILE_COLUMNS)}, added) "
+                    f"VALUES ({', '.join('?' * len(FILE_COLUMNS))}, ?) "
+                    "ON CONFLICT (file_unique_id) DO UPDATE SET "
+                    + ", ".join(f"{c} = COALESCE({c}, excluded.{c})" for c in FILE_COLUMNS[3:])
+                    + " RETURNING id",
+                    _values(meta) + (now,)).fetchone()[0]
+                db.execute("INSERT INTO content_items (button, position, file, caption) VALUES (?, ?, ?, ?)",
+                           (button_id, position, file_id, caption))
+        return button_id
+
+    def buttons(self, since=0):
+        # دکمه‌های با id بیشتر از since، به ترتیب ثبت:
+        # [(id, node_id, button, [(FileMeta, caption), ...]), ...]
+        db = self._db()
+        rows = db.execute(
+            f"SELECT b.id, b.node_id, b.button, i.caption, {', '.join('f.' + c for c in FILE_COLUMNS)} "
+            "FROM content_buttons AS b JOIN content_items AS i ON i.button = b.id "
+            "JOIN content_files AS f ON f.id = i.file WHERE b.id > ? ORDER BY b.id, i.position",
+            (since,)).fetchall()
+        buttons = []
+        for button_id, node_id, button, caption, *meta in rows:
+            if not buttons or buttons[-1][0] != button_id:
+                buttons.append((button_id, node_id, button, []))
+            buttons[-1][3].append((FileMeta(*meta), caption))
+        return buttons
+
+    # --- آپلودهای /get_ids ---
+
+    def start_uploads(self, chat_id):
+        # از این به بعد فایل‌های این چت جمع می‌شن؛ فایل‌های نیمه‌کاره‌ی قبلی پاک می‌شن
+        db = self._db()
+        with transaction(db):
+            db.execute("INSERT OR REPLACE INTO upload_sessions (chat_id, started) VALUES (?, ?)",
+                       (chat_id, self.clock()))
+            db.execute("DELETE FROM upload_files WHERE chat_id = ? AND ready = 0", (chat_id,))
+
+    def add_upload(self, chat_id, message_id, meta, caption):
+        # فقط برای چتی که /get_ids زده ثبت می‌شه؛ True اگه ثبت شد
+        return self._db().execute(
+            f"INSERT INTO upload_files (chat_id, ready, position, {', '.join(FILE_COLUMNS)}, caption) "
+            f"SELECT ?, 0, ?, {', '.join('?' * len(FILE_COLUMNS))}, ? "
+            "WHERE EXISTS (SELECT 1 FROM upload_sessions WHERE chat_id = ?)",
+            (chat_id, message_id) + _values(meta) + (caption, chat_id)).rowcount > 0
+
+    def take_uploads(self, chat_id):
+        # فایل‌های دریافت‌شده به ترتیب ارسال، [(FileMeta, caption), ...]؛ از جدول
+        # برداشته می‌شن ولی چت همچنان در حال دریافت می‌مونه
+        rows = self._db().execute(
+            f"DELETE FROM upload_files WHERE chat_id = ? AND ready = 0 "
+            f"RETURNING position, id, {', '.join(FILE_COLUMNS)}, caption", (chat_id,)).fetchall()
+        rows.sort(key=lambda row: row[:2])
+        return [(FileMeta(*row[2:-1]), row[-1]) for row in rows]
+
+    def keep_uploads(self, chat_id, files):
+        # لیست آماده‌ی /attach این چت با files جایگزین می‌شه
+        db = self._db()
+        with transaction(db):
+            db.execute("DELETE FROM upload_files WHERE chat_id = ? AND ready = 1", (chat_id,))
+            db.executemany(
+                f"INSERT INTO upload_files (chat_id, ready, position, {', '.join(FILE_COLUMNS)}, caption) "
+                f"VALUES (?, 1, ?, {', '.join('?' * len(FILE_COLUMNS))}, ?)",
+                [(chat_id, position) + _values(meta) + (caption,) for position, (meta, caption) in enumerate(files)])
+
+    def uploads(self, chat_id):
+        # فایل‌های آماده‌ی /attach، [(FileMeta, caption), ...]
+        rows = self._db().execute(
+            f"SELECT {', '.join(FILE_COLUMNS)}, caption FROM upload_files "
+            "WHERE chat_id = ? AND ready = 1 ORDER BY position", (chat_id,))
+        return [(FileMeta(*row[:-1]), row[-1]) for row in rows]
+
+    def clear_uploads(self, chat_id):
+        self._db().execute("DELETE FROM upload_files WHERE chat_id = ? AND ready = 1", (chat_id,))
+
+    # --- گروه‌های مدیا ---
+
+    # گروهی که این‌قدر (ثانیه) پیامی نگرفته و پردازش نشده (مثلاً worker
+    # ری‌استارت شده) کنار گذاشته می‌شه
+    GROUP_TTL = 3600
+
+    def add_to_group(self, group_id, chat_id):
+        # یک پیام دیگه‌ی این آلبوم؛ (تعداد، زمان اولین پیام، زمان آخرین پیام)
+        now = self.clock()
+        return self._db().execute(
+            "INSERT INTO media_groups (group_id, chat_id, size, started, last) VALUES (?, ?, 1, ?, ?) "
+            "ON CONFLICT (group_id) DO UPDATE SET size = size + 1, last = excluded.last "
+            "RETURNING size, started, last", (group_id, chat_id, now, now)).fetchone()
+
+    def media_group(self, group_id):
+        # (chat_id، تعداد، زمان اولین پیام، زمان آخرین پیام) یا None
+        return self._db().execute(
+            "SELECT chat_id, size, started, last FROM media_groups WHERE group_id = ?", (group_id,)).fetchone()
+
+    def take_group(self, group_id, last):
+        # فقط اگه از last پیام تازه‌ای نرسیده حذف می‌شه؛ از بین workerهایی که
+        # هم‌زمان بررسی می‌کنن فقط یکی True می‌گیره
+        db = self._db()
+        db.execute("DELETE FROM media_groups WHERE last < ?", (self.clock() - self.GROUP_TTL,))
+        return db.execute("DELETE FROM media_groups WHERE group_id = ? AND last = ?",
+                          (group_id, last)).rowcount > 0
+
+
+def _values(meta):
+    return tuple(getattr(meta, c) for c in FILE_COLUMNS)
@@ -0,0 +1,46 @@
+# ===============================================================
+# اتصال‌های SQLite 🔌
+# ===============================================================
+# صف ارسال مشترک، دفترچه‌ی آپدیت‌ها، محتوای /get_ids و بررسی فایل‌ها همه
+# روی فایل دیتابیس حالت‌ها (STATE_DB) کار می‌کنن و اتصال‌هاشون رو از
+# همین‌جا می‌گیرن. هر thread (و بعد از fork هر پروسه‌ی worker) اتصال خودش
+# رو داره؛ اتصال‌ها autocommit هستن و چند نوشتن که باید با هم انجام بشن در
+# transaction می‌رن. timeout: اگه پروسه‌ی دیگه‌ای در حال نوشتنه تا ۱۰ ثانیه
+# صبر می‌کنه.
+
+import contextlib
+import os
+import sqlite3
+import threading
+
+
+def connect(path):
+    db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+@contextlib.contextmanager
+def transaction(db):
+    # قفل نوشتن از اول گرفته می‌شه تا وسط تراکنش به SQLITE_BUSY نخوره
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        yield db
+        db.execute("COMMIT")
+    except Exception:
+        db.execute("ROLLBACK")
+        raise
+
+
+class ThreadConnections:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def __call__(self):
+        # اتصال همین thread؛ بعد از fork اتصال پروسه‌ی والد کنار گذاشته می‌شه
+        db = getattr(self._local, 'db', None)
+        if db is None or self._local.pid != os.getpid():
+            db = self._local.db = connect(self.path)
+            self._local.pid = os.getpid()
+        return db
@@ -0,0 +1,337 @@
+# ===============================================================
+# ارسال فایل‌ها به کاربر 📦
+# ===============================================================
+# آیتم‌های پشت‌سرهم از یک نوع، در آلبوم‌های حداکثر ۱۰تایی با
+# send_media_group فرستاده می‌شن و ترتیب اصلی حفظ می‌شه.
+# قوانین تلگرام: عکس و ویدیو می‌تونن با هم آلبوم بشن، سند فقط با سند،
+# صدا فقط با صدا؛ ویس و پیام متنی همیشه جدا فرستاده می‌شن.
+# آیتم copy یک بازه از پیام‌های کانال ذخیره‌ست که با copy_messages (هر
+# درخواست تا ۱۰۰ پیام، با همون ترتیب و کپشن‌های کانال) کپی می‌شه؛ چون به
+# شماره‌ی پیام اشاره می‌کنه، عوض شدن file_idها روش اثری نداره.
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from telebot import types
+
+from db import ThreadConnections, connect
+
+ALBUM_LIMIT = 10
+COPY_LIMIT = 100
+
+ALBUM_GROUPS = {
+    'photo': 'visual',
+    'video': 'visual',
+    'document': 'document',
+    'audio': 'audio',
+}
+
+INPUT_MEDIA = {
+    'photo': types.InputMediaPhoto,
+    'video': types.InputMediaVideo,
+    'document': types.InputMediaDocument,
+    'audio': types.InputMediaAudio,
+}
+
+
+def plan_batches(items, albums=True):
+    # خروجی: لیستی از دسته‌ها؛ هر دسته یا یک آیتم تکیه یا یک آلبوم
+    batches = []
+    runs = []
+    run_group = None
+
+    for item in items:
+        group = ALBUM_GROUPS.get(item[0]) if albums else None
+        if group is None or group != run_group:
+            runs.append([])
+        runs[-1].append(item)
+        run_group = group
+
+    for run in runs:
+        for i in range(0, len(run), ALBUM_LIMIT):
+            chunk = run[i:i + ALBUM_LIMIT]
+            batches.append(chunk if len(chunk) > 1 else chunk[0])
+    return batches
+
+
+def copy_batches(value):
+    # "storage_chat:اول-آخر" ← storage_chat و شماره‌ی پیام‌ها در دسته‌های ۱۰۰تایی
+    from_chat, _, span = value.rpartition(':')
+    first, last = (int(n) for n in span.split('-'))
+    ids = list(range(first, last + 1))
+    return from_chat, [ids[i:i + COPY_LIMIT] for i in range(0, len(ids), COPY_LIMIT)]
+
+
+def send_item(bot, chat_id, item):
+    kind, value, caption = item
+    if kind == 'message':
+        return bot.send_message(chat_id, value)
+    try:
+        if kind == 'copy':
+            from_chat, batches = copy_batches(value)
+            return [bot.copy_messages(chat_id, from_chat, ids) for ids in batches]
+        return getattr(bot, f"send_{kind}")(chat_id, value, caption=caption)
+    except Exception as e:
+        print(f"Error sending {kind} {value}: {e}")
+        bot.send_message(chat_id, f"❗ خطا در ارسال فایل: {e}")
+
+
+def send_album(bot, chat_id, album):
+    media = [INPUT_MEDIA[kind](value, caption=caption) for kind, value, caption in album]
+    try:
+        return bot.send_media_group(chat_id, media)
+    except Exception as e:
+        # اگه یکی از فایل‌ها خراب باشه کل آلبوم رد می‌شه؛ تکی می‌فرستیم
+        # تا بقیه برسن و خطای همون فایل گزارش بشه
+        print(f"Error sending album of {len(album)}: {e}")
+        for item in album:
+            send_item(bot, chat_id, item)
+
+
+def send_items(bot, chat_id, items, albums=True):
+    for batch in plan_batches(items, albums):
+        if isinstance(batch, list):
+            send_album(bot, chat_id, batch)
+        else:
+            send_item(bot, chat_id, batch)
+
+
+# ===============================================================
+# صف ارسال: هندلرها فقط کار رو در صف می‌ذارن و برمی‌گردن 🧵
+# ===============================================================
+# ارسال‌های حجیم (مثلاً ۴۰ ویدیو) روی چند thread جداگانه انجام می‌شن تا
+# پاسخ منوها هیچ‌وقت پشت آپلودها منتظر نمونه.
+# هر چت همیشه به یک خط (lane) ثابت می‌ره و هر خط فقط یک thread داره؛
+# پس فایل‌های یک دانشجو دقیقاً به ترتیب جلسه‌ها می‌رسن ولی چت‌های
+# مختلف هم‌زمان و روی اتصال‌های جدا ارسال می‌شن.
+
+class DeliveryJob:
+    __slots__ = ('chat_id', 'items', 'enqueued', 'started', 'finished')
+
+    def __init__(self, chat_id, items):
+        self.chat_id = chat_id
+        self.items = items
+        self.enqueued = time.monotonic()
+        self.started = None
+        self.finished = None
+
+
+class DeliveryQueue:
+    def __init__(self, bot, lanes=4, albums=True):
+        self.bot = bot
+        self.albums = albums
+        self._lanes = [queue.Queue() for _ in range(max(1, lanes))]
+        self._threads = []
+        self._lock = threading.Lock()
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_total = 0.0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def start(self):
+        for i, lane in enumerate(self._lanes):
+            t = threading.Thread(target=self._worker, args=(lane,), name=f"delivery-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def lane_of(self, chat_id):
+        return hash(chat_id) % len(self._lanes)
+
+    def submit(self, chat_id, items):
+        job = DeliveryJob(chat_id, items)
+        with self._lock:
+            self.submitted += 1
+        self._lanes[self.lane_of(chat_id)].put(job)
+        return job
+
+    def depth(self):
+        return sum(lane.qsize() for lane in self._lanes)
+
+    def join(self):
+        for lane in self._lanes:
+            lane.join()
+
+    def run_job(self, job):
+        job.started = time.monotonic()
+        ok = True
+        try:
+            send_items(self.bot, job.chat_id, job.items, albums=self.albums)
+        except Exception as e:
+            ok = False
+            print(f"Delivery to {job.chat_id} failed: {e}")
+        job.finished = time.monotonic()
+        latency = job.finished - job.enqueued
+        with self._lock:
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+            self.wait_total += job.started - job.enqueued
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+
+    def _worker(self, lane):
+        while True:
+            job = lane.get()
+            try:
+                self.run_job(job)
+            finally:
+                lane.task_done()
+
+    def stats(self):
+        with self._lock:
+            done = self.completed + self.failed
+            return {
+                'depth': self.depth(),
+                'lanes': len(self._lanes),
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'wait_avg': round(self.wait_total / done, 3) if done else 0.0,
+                'latency_avg': round(self.latency_total / done, 3) if done else 0.0,
+                'latency_max': round(self.latency_max, 3),
+            }
+
+
+# ===============================================================
+# صف ارسال مشترک بین چند پروسه (workerهای گانیکورن) روی SQLite 🗄️
+# ===============================================================
+# هر worker کارها رو در جدول delivery_jobs می‌نویسه و خط‌های ارسال همه‌ی
+# workerها از همون جدول کار برمی‌دارن. یک کار فقط وقتی برداشته می‌شه که
+# کوچیک‌ترین id باقی‌مونده‌ی همون چت باشه؛ پس تا کار قبلی یک چت تموم و
+# حذف نشده، هیچ پروسه‌ای کار بعدی اون چت رو شروع نمی‌کنه و ترتیب فایل‌های
+# هر دانشجو بین همه‌ی workerها حفظ می‌شه.
+
+class SharedDeliveryQueue(DeliveryQueue):
+    # وقتی کاری نیست، هر خط هر چند وقت یک بار جدول رو نگاه می‌کنه (کارهای
+    # workerهای دیگه)؛ از POLL_INTERVAL شروع و تا IDLE_MAX دو برابر می‌شه
+    POLL_INTERVAL = 0.05
+    IDLE_MAX = 1.0
+
+    def __init__(self, bot, path, lanes=4, albums=True):
+        super().__init__(bot, lanes=lanes, albums=albums)
+        self.path = path
+        self._db = ThreadConnections(path)
+        # کارهای همین پروسه خط‌ها رو بدون صبر برای POLL_INTERVAL بیدار می‌کنن
+        self._wake = threading.Event()
+        db = connect(path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS delivery_jobs ("
+            "id INTEGER PRIMARY KEY, chat_id INTEGER NOT NULL, items TEXT NOT NULL, "
+            "enqueued REAL NOT NULL, owner INTEGER)")
+        db.execute("CREATE INDEX IF NOT EXISTS delivery_jobs_chat ON delivery_jobs (chat_id, id)")
+        db.close()
+
+    def start(self):
+        self.recover()
+        for i in range(len(self._lanes)):
+            t = threading.Thread(target=self._worker, args=(None,), name=f"delivery-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def recover(self):
+        # کارهایی که پروسه‌ی صاحبشون دیگه زنده نیست (کرش یا ری‌استارت worker)
+        # دوباره آزاد می‌شن
+        db = self._db()
+        owners = [row[0] for row in db.execute(
+            "SELECT DISTINCT owner FROM delivery_jobs WHERE owner IS NOT NULL")]
+        dead = [(pid,) for pid in owners if not _alive(pid)]
+        db.executemany("UPDATE delivery_jobs SET owner = NULL WHERE owner = ?", dead)
+        return len(dead)
+
+    def submit(self, chat_id, items):
+        job = DeliveryJob(chat_id, items)
+        self._db().execute(
+            "INSERT INTO delivery_jobs (chat_id, items, enqueued) VALUES (?, ?, ?)",
+            (chat_id, json.dumps([list(item) for item in items]), time.time()))
+        with self._lock:
+            self.submitted += 1
+        self._wake.set()
+        return job
+
+    def claim(self):
+        # اول یک SELECT فقط‌خواندنی؛ قفل نوشتن فقط وقتی گرفته می‌شه که کاری
+        # پیدا شده باشه. id کاری که کوچیک‌ترین id چتشه تا حذفش همین‌طور می‌مونه،
+        # پس کافیه UPDATE فقط برداشته نشدنش رو دوباره بررسی کنه
+        db = self._db()
+        while True:
+            row = db.execute(
+                "SELECT id, chat_id, items, enqueued FROM delivery_jobs AS j "
+                "WHERE owner IS NULL AND id = "
+                "(SELECT MIN(id) FROM delivery_jobs WHERE chat_id = j.chat_id) "
+                "ORDER BY id LIMIT 1").fetchone()
+            if row is None:
+                return None, None
+            taken = db.execute("UPDATE delivery_jobs SET owner = ? WHERE id = ? AND owner IS NULL",
+                               (os.getpid(), row[0])).rowcount
+            if taken:
+                break
+            # یک خط دیگه زودتر برداشت؛ کار بعدی
+        job_id, chat_id, items, enqueued = row
+        job = DeliveryJob(chat_id, [tuple(item) for item in json.loads(items)])
+        # زمان انتظار از لحظه‌ی ثبت در جدول حساب می‌شه (ساعت دیواری، بین پروسه‌ها)
+        job.enqueued = time.monotonic() - max(0.0, time.time() - enqueued)
+        return job_id, job
+
+    def finish(self, job_id):
+        # تا کار حذف نشه، کار بعدی همون چت برداشته نمی‌شه؛ پس با قفل بودن
+        # دیتابیس هم رها نمی‌شه و دوباره امتحان می‌شه
+        delay = self.POLL_INTERVAL
+        while True:
+            try:
+                self._db().execute("DELETE FROM delivery_jobs WHERE id = ?", (job_id,))
+                return
+            except sqlite3.OperationalError as e:
+                print(f"Could not finish delivery job {job_id}: {e}")
+                time.sleep(delay)
+                delay = min(delay * 2, self.IDLE_MAX)
+
+    def _worker(self, lane):
+        # وقتی کاری نیست فاصله‌ی نگاه کردن به جدول تا IDLE_MAX بیشتر می‌شه؛
+        # کارهای همین پروسه خط‌ها رو با _wake فوراً بیدار می‌کنن
+        idle = self.POLL_INTERVAL
+        while True:
+            try:
+                job_id, job = self.claim()
+            except sqlite3.OperationalError as e:
+                print(f"Could not claim delivery job: {e}")
+                job_id = None
+            if job_id is None:
+                if self._wake.wait(idle):
+                    self._wake.clear()
+                    idle = self.POLL_INTERVAL
+                else:
+                    idle = min(idle * 2, self.IDLE_MAX)
+                continue
+            idle = self.POLL_INTERVAL
+            try:
+                self.run_job(job)
+            finally:
+                self.finish(job_id)
+
+    def depth(self):
+        return self._db().execute("SELECT COUNT(*) FROM delivery_jobs").fetchone()[0]
+
+    def join(self):
+        while self.depth():
+            time.sleep(self.POLL_INTERVAL)
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
@@ -0,0 +1,166 @@
+# ===============================================================
+# بررسی سالم بودن file_idهای منوها 🩺
+# ===============================================================
+# یک file_id اشتباه یا منقضی‌شده تا وقتی دانشجویی روی دکمه‌اش نزنه معلوم
+# نمی‌شه. اینجا هر فایل واقعی منوها (هر file_unique_id یک بار) با getFile
+# بررسی می‌شه، آهسته و در پس‌زمینه: هر بار step فقط یک فایل، اونی که
+# هیچ‌وقت یا از همه دیرتر بررسی شده. نتیجه (نوع، حجم، file_unique_id،
+# مسیر فایل یا خطا) در جدول file_health همون SQLite می‌مونه؛ پس بعد از
+# ری‌استارت از اول شروع نمی‌شه و workerها یک فایل رو دوباره بررسی نمی‌کنن.
+# فایل‌هایی که تلگرام نمی‌شناسه broken علامت می‌خورن و ارسال‌ها ازشون رد
+# می‌شن؛ خطاهای موقت (شبکه، 429، ...) فقط بعداً دوباره امتحان می‌شن. پیام
+# 400 تلگرام («wrong file_id or the file is temporarily unavailable») ممکنه
+# موقتی باشه، پس اولین 400 هم خطای موقته و فقط دو 400 پشت‌سرهم یعنی خراب.
+
+import threading
+import time
+
+from telebot.apihelper import ApiTelegramException
+
+from catalog import FILE_KINDS, FileMeta
+from db import ThreadConnections, connect
+
+OK = 'ok'
+BROKEN = 'broken'
+ERROR = 'error'
+
+COLUMNS = ('file_id', 'kind', 'status', 'file_unique_id', 'file_size', 'file_path', 'error', 'code', 'checked')
+
+
+class FileHealth:
+    # خطای getFile برای فایل‌های بزرگ‌تر از 20MB؛ فایل وجود داره و ارسالش کار می‌کنه
+    TOO_BIG = 'file is too big'
+    # فایل‌هایی که با خطای موقت مواجه شدن زودتر از max_age دوباره بررسی می‌شن
+    ERROR_RETRY = 600
+
+    def __init__(self, path, max_age=86400, clock=time.time):
+        self.path = path
+        self.max_age = max_age
+        self.clock = clock
+        self._db = ThreadConnections(path)
+        self._lock = threading.Lock()
+        db = connect(path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS file_health ("
+            "file_id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT, file_unique_id TEXT, "
+            "file_size INTEGER, file_path TEXT, error TEXT, code INTEGER, checked REAL NOT NULL)")
+        # دیتابیس‌های قبلی کد خطا رو نداشتن
+        if 'code' not in [row[1] for row in db.execute("PRAGMA table_info(file_health)")]:
+            db.execute("ALTER TABLE file_health ADD COLUMN code INTEGER")
+        db.close()
+        self._broken = frozenset()
+        self.reload()
+
+        self.checks = 0
+        self.errors = 0
+
+    def reload(self):
+        # فایل‌های خراب (شاید یک worker دیگه پیداشون کرده باشه)
+        rows = self._db().execute("SELECT file_id FROM file_health WHERE status = ?", (BROKEN,))
+        self._broken = frozenset(file_id for file_id, in rows)
+        return self._broken
+
+    def known(self):
+        # مشخصات فایل‌های سالمی که file_unique_id شون معلوم شده (برای catalog.files)
+        rows = self._db().execute(
+            "SELECT kind, file_id, file_unique_id, file_size FROM file_health "
+            "WHERE status = ? AND file_unique_id IS NOT NULL ORDER BY checked", (OK,))
+        return [FileMeta(kind, file_id, unique, file_size=size) for kind, file_id, unique, size in rows]
+
+    def is_broken(self, file_id):
+        return file_id in self._broken
+
+    def usable(self, items):
+        # آیتم‌های قابل ارسال و تعداد فایل‌های خراب کنارگذاشته
+        broken = self._broken
+        if not broken:
+            return items, 0
+        kept = tuple(item for item in items if item[0] not in FILE_KINDS or item[1] not in broken)
+        return kept, len(items) - len(kept)
+
+    # --- بررسی ---
+
+    def due(self, files):
+        # فایل بعدی برای بررسی: اول هیچ‌وقت بررسی‌نشده‌ها، بعد قدیمی‌ترین
+        checked = dict(self._db().execute("SELECT file_id, checked FROM file_health"))
+        stale = self.clock() - self.max_age
+        candidates = [meta for meta in files if checked.get(meta.file_id, 0) <= stale]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda meta: checked.get(meta.file_id, 0))
+
+    def claim(self, meta):
+        # یک ردیف «در حال بررسی»؛ اگه worker دیگه‌ای زودتر برداشته باشه False
+        now = self.clock()
+        row = self._db().execute(
+            "INSERT INTO file_health (file_id, kind, checked) VALUES (?, ?, ?) "
+            "ON CONFLICT (file_id) DO UPDATE SET checked = excluded.checked WHERE checked <= ? "
+            "RETURNING file_id", (meta.file_id, meta.kind, now, now - self.max_age)).fetchone()
+        return row is not None
+
+    def check(self, bot, meta):
+        # یک getFile (از همون محدودکننده‌ی ارسال‌ها)؛ وضعیت برمی‌گرده و
+        # file_unique_id و حجم روی خود meta نوشته می‌شن
+        try:
+            info = bot.get_file(meta.file_id)
+        except ApiTelegramException as e:
+            if e.error_code == 400 and self.TOO_BIG in (e.description or ''):
+                return self.record(meta, OK)
+            status = BROKEN if e.error_code == 400 and self.last_code(meta) == 400 else ERROR
+            return self.record(meta, status, error=e.description, code=e.error_code)
+        except Exception as e:
+            return self.record(meta, ERROR, error=str(e))
+        meta.file_unique_id = meta.file_unique_id or info.file_unique_id
+        meta.file_size = meta.file_size or info.file_size
+        return self.record(meta, OK, file_path=info.file_path)
+
+    def last_code(self, meta):
+        # کد خطای بررسی قبلی همین فایل (None اگه سالم بوده یا بررسی نشده)
+        row = self._db().execute("SELECT code FROM file_health WHERE file_id = ?", (meta.file_id,)).fetchone()
+        return row[0] if row else None
+
+    def record(self, meta, status, file_path=None, error=None, code=None):
+        checked = self.clock()
+        if status == ERROR:
+            checked -= max(self.max_age - self.ERROR_RETRY, 0)
+        self._db().execute(
+            "UPDATE file_health SET status = ?, file_unique_id = ?, file_size = ?, file_path = ?, "
+            "error = ?, code = ?, checked = ? WHERE file_id = ?",
+            (status, meta.file_unique_id, meta.file_size, file_path, error, code, checked, meta.file_id))
+        with self._lock:
+            self.checks += 1
+            if status == ERROR:
+                self.errors += 1
+            if status == BROKEN:
+                self._broken = self._broken | {meta.file_id}
+            elif meta.file_id in self._broken and status == OK:
+                self._broken = self._broken - {meta.file_id}
+        if status != OK:
+            print(f"File check {meta.kind} {meta.file_id}: {status} ({error})")
+        return status
+
+    def step(self, bot, files):
+        # بررسی یک فایل از files (هر FileMeta یک فایل واقعی)؛ (فایل بررسی‌شده،
+        # وضعیت) یا (None, None) اگه چیزی برای بررسی نبود
+        self.reload()
+        meta = self.due(files)
+        if meta is None or not self.claim(meta):
+            return None, None
+        return meta, self.check(bot, meta)
+
+    # --- گزارش ---
+
+    def rows(self):
+        # همه‌ی نتیجه‌ها به شکل dict، خراب‌ها اول
+        rows = self._db().execute(
+            f"SELECT {', '.join(COLUMNS)} FROM file_health "
+            "ORDER BY status = 'broken' DESC, status = 'error' DESC, checked")
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def stats(self):
+        counts = dict(self._db().execute(
+            "SELECT COALESCE(status, 'checking'), COUNT(*) FROM file_health GROUP BY 1"))
+        with self._lock:
+            counts.update(checks=self.checks, errors=self.errors, broken=len(self._broken))
+        return counts
@@ -0,0 +1,163 @@
+# ===============================================================
+# شمارنده‌ها و /metrics به قالب متنی Prometheus 📈
+# ===============================================================
+# هر thread شمارنده‌ها و هیستوگرام‌هاش رو در dict خودش می‌نویسه؛ پس
+# inc و observe هیچ قفلی نمی‌گیرن و threadهای هندلر و ارسال با هم درگیر
+# نمی‌شن. فقط موقع scrape (یعنی render) dict همه‌ی threadها جمع زده
+# می‌شه. dict threadهای تموم‌شده (سرور توسعه‌ی Flask برای هر درخواست یک
+# thread می‌سازه) هر بار که thread تازه‌ای اولین ثبتش رو می‌کنه، و موقع
+# scrape، در retired ادغام و کنار گذاشته می‌شن؛ پس بدون scrape هم زیاد
+# نمی‌شن. مقدارهایی که جای دیگه شمرده می‌شن (stats() صف ارسال، poller و
+# ...) با collect فقط موقع scrape خونده می‌شن.
+# هر پروسه شمارنده‌های خودش رو داره؛ با چند worker گانیکورن هر scrape
+# عددهای همون workerی رو نشون می‌ده که درخواست بهش رسیده (برچسب pid).
+
+import bisect
+import os
+import threading
+
+# ثانیه؛ از پاسخ منو (میلی‌ثانیه) تا getUpdates با long polling
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels, extra=()):
+    pairs = tuple(labels) + tuple(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    def __init__(self, prefix='jozvebot'):
+        self.prefix = prefix
+        self._local = threading.local()
+        # (thread, dict) برای هر threadی که چیزی ثبت کرده
+        self._shards = []
+        self._shards_lock = threading.Lock()
+        self._retired = {}
+        # اسم -> (نوع، توضیح، bucketها)
+        self._meta = {}
+        # (اسم، نوع، توضیح، تابعی که {برچسب‌ها: مقدار} برمی‌گردونه)
+        self._collectors = []
+
+    # --- تعریف ---
+
+    def counter(self, name, help):
+        self._meta[name] = ('counter', help, None)
+
+    def histogram(self, name, help, buckets=DEFAULT_BUCKETS):
+        self._meta[name] = ('histogram', help, tuple(buckets))
+
+    def collect(self, name, kind, help, callback):
+        # callback موقع scrape صدا زده می‌شه: {(('label', value), ...): عدد}
+        self._collectors.append((name, kind, help, callback))
+
+    # --- ثبت (بدون قفل) ---
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            # فقط بار اول هر thread
+            with self._shards_lock:
+                self._retire_dead()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _retire_dead(self):
+        # با _shards_lock صدا زده می‌شه؛ thread تموم‌شده دیگه در dictش نمی‌نویسه
+        alive = [entry for entry in self._shards if entry[0].is_alive()]
+        if len(alive) < len(self._shards):
+            for thread, shard in self._shards:
+                if not thread.is_alive():
+                    self._merge(self._retired, shard)
+            self._shards = alive
+
+    def inc(self, name, labels=(), value=1):
+        shard = self._shard()
+        key = (name, labels)
+        shard[key] = shard.get(key, 0) + value
+
+    def observe(self, name, value, labels=()):
+        shard = self._shard()
+        key = (name, labels)
+        slots = shard.get(key)
+        if slots is None:
+            # شمارش هر bucket (غیرتجمعی)، بعد +Inf، بعد جمع مقدارها
+            slots = shard[key] = [0] * (len(self._meta[name][2]) + 2)
+        slots[bisect.bisect_left(self._meta[name][2], value)] += 1
+        slots[-1] += value
+
+    # --- scrape ---
+
+    @staticmethod
+    def _merge(into, shard):
+        for key, value in shard.items():
+            if isinstance(value, list):
+                total = into.get(key)
+                if total is None:
+                    into[key] = list(value)
+                else:
+                    for i, v in enumerate(value):
+                        total[i] += v
+            else:
+                into[key] = into.get(key, 0) + value
+
+    def snapshot(self):
+        # جمع همه‌ی threadها؛ dict.copy در CPython اتمیه و thread صاحبش رو نگه نمی‌داره
+        with self._shards_lock:
+            self._retire_dead()
+            shards = list(self._shards)
+            totals = {}
+            self._merge(totals, self._retired)
+        for thread, shard in shards:
+            self._merge(totals, shard.copy())
+        return totals
+
+    def render(self):
+        totals = self.snapshot()
+        pid = (('pid', os.getpid()),)
+        by_name = {}
+        for (name, labels), value in totals.items():
+            by_name.setdefault(name, []).append((labels, value))
+        lines = []
+        for name, (kind, help, buckets) in self._meta.items():
+            full = f"{self.prefix}_{name}"
+            lines.append(f"# HELP {full} {help}")
+            lines.append(f"# TYPE {full} {kind}")
+            for labels, value in sorted(by_name.get(name, ()), key=lambda entry: entry[0]):
+                if kind == 'counter':
+                    lines.append(f"{full}{_labels(labels, pid)} {_number(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets + (float('inf'),), value):
+                    cumulative += count
+                    lines.append(f"{full}_bucket{_labels(labels, pid + (('le', _number(bound)),))} {cumulative}")
+                lines.append(f"{full}_sum{_labels(labels, pid)} {_number(round(value[-1], 6))}")
+                lines.append(f"{full}_count{_labels(labels, pid)} {cumulative}")
+        for name, kind, help, callback in self._collectors:
+            full = f"{self.prefix}_{name}"
+            try:
+                samples = callback()
+            except Exception as e:
+                print(f"Metrics collector {name} failed: {e}")
+                continue
+            lines.append(f"# HELP {full} {help}")
+            lines.append(f"# TYPE {full} {kind}")
+            for labels, value in sorted(samples.items()):
+                lines.append(f"{full}{_labels(labels, pid)} {_number(value)}")
+        return "\n".join(lines) + "\n"
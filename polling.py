@@ -0,0 +1,174 @@
+# ===============================================================
+# دریافت آپدیت‌ها با long polling 📡
+# ===============================================================
+# به‌جای infinity_polling، حلقه‌ی خودمون getUpdates رو صدا می‌زنه:
+#   - timeout طولانی (پیش‌فرض ۲۵ ثانیه): وقتی آپدیتی نیست، تلگرام درخواست
+#     رو باز نگه می‌داره، پس ربات بیکار چند درخواست در دقیقه می‌فرسته نه ده‌ها
+#   - allowed_updates: فقط نوع آپدیت‌هایی که هندلر دارن (پیش‌فرض message)
+#   - اندازه‌ی دسته (limit) تطبیقی: وقتی دسته‌ها پر برمی‌گردن بزرگ‌تر می‌شه
+#     و در زمان خلوت دوباره کوچیک می‌شه
+# آمار: تعداد poll خالی، اندازه‌ی دسته‌ها و تأخیر (سن آپدیت موقع دریافت).
+# با journal (UpdateJournal) آپدیت‌های تکراری کنار گذاشته می‌شن و بعد از
+# ری‌استارت polling از آخرین آپدیت ثبت‌شده ادامه پیدا می‌کنه؛ با backlog
+# (Backlog) آپدیت‌های قدیمیِ زمان خاموشی جدا و خلاصه پردازش می‌شن.
+# هر دو موتور sync و async از همین کلاس استفاده می‌کنن.
+
+import asyncio
+import threading
+import time
+
+MAX_BATCH = 100
+
+
+def parse_allowed_updates(value):
+    # "message,callback_query" -> ['message', 'callback_query']
+    return [kind.strip() for kind in value.split(',') if kind.strip()]
+
+
+def update_date(update):
+    message = update.message or update.edited_message or update.channel_post
+    if message is not None:
+        return message.date
+    if update.callback_query is not None and update.callback_query.message is not None:
+        return update.callback_query.message.date
+    return None
+
+
+class Poller:
+    RETRY_DELAY = 3
+
+    def __init__(self, timeout=25, allowed_updates=('message',), min_batch=10,
+                 max_batch=MAX_BATCH, journal=None, backlog=None, metrics=None, clock=time.time):
+        if not 1 <= min_batch <= max_batch <= MAX_BATCH:
+            raise ValueError(f"batch sizes must satisfy 1 <= min <= max <= {MAX_BATCH}")
+        self.timeout = timeout
+        self.allowed_updates = list(allowed_updates)
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.journal = journal
+        self.backlog = backlog
+        # اگه باشه، آپدیت‌های دریافتی در updates_received_total شمرده می‌شن
+        self.metrics = metrics
+        self.clock = clock
+        self.limit = min_batch
+        self.offset = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self.polls = 0
+        self.empty_polls = 0
+        self.errors = 0
+        self.updates = 0
+        self.batch_max = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+
+    def request(self):
+        # پارامترهای getUpdates بعدی
+        if self.offset is None and self.journal is not None:
+            self.offset = self.journal.offset()
+        return {'offset': self.offset, 'limit': self.limit, 'timeout': self.timeout,
+                'allowed_updates': self.allowed_updates}
+
+    def record(self, updates):
+        # بعد از هر getUpdates: offset جلو می‌ره، آمار ثبت و limit تنظیم می‌شه
+        now = self.clock()
+        with self._lock:
+            self.polls += 1
+            if not updates:
+                self.empty_polls += 1
+            else:
+                self.offset = updates[-1].update_id + 1
+                self.updates += len(updates)
+                self.batch_max = max(self.batch_max, len(updates))
+                for update in updates:
+                    date = update_date(update)
+                    if date is not None:
+                        lag = max(0.0, now - date)
+                        self.lag_total += lag
+                        self.lag_max = max(self.lag_max, lag)
+            if len(updates) >= self.limit:
+                # دسته پر بود: احتمالاً آپدیت‌های بیشتری منتظرن
+                self.limit = min(self.max_batch, self.limit * 2)
+            elif len(updates) < self.limit // 4:
+                self.limit = max(self.min_batch, self.limit // 2)
+
+    def accept(self, updates):
+        # آپدیت‌هایی که باید به هندلرها برسن؛ اگه ثبت در journal خطا بده offset
+        # جلو نمی‌ره و همین دسته دوباره گرفته می‌شه
+        fresh = updates
+        if updates and self.journal is not None:
+            fresh = self.journal.claim(updates)
+        self.record(updates)
+        if updates and self.metrics is not None:
+            self.metrics.inc('updates_received_total', (('source', 'polling'),), len(updates))
+        if fresh and self.backlog is not None:
+            fresh = self.backlog.filter(fresh)
+        return fresh
+
+    def failed(self, error):
+        with self._lock:
+            self.errors += 1
+        print(f"Error in polling: {error}")
+
+    def run(self, bot, dispatcher=None):
+        # حالت sync: هندلرهای TeleBot (threaded) آپدیت‌ها رو در threadهای خودشون
+        # پردازش می‌کنن، پس poll بعدی بلافاصله فرستاده می‌شه
+        dispatcher = dispatcher or bot
+        self._stop.clear()
+        while not self._stop.is_set():
+            try:
+                params = self.request()
+                updates = bot.get_updates(
+                    offset=params['offset'], limit=params['limit'],
+                    allowed_updates=params['allowed_updates'],
+                    timeout=self.timeout + 10, long_polling_timeout=params['timeout'])
+                updates = self.accept(updates)
+            except Exception as e:
+                self.failed(e)
+                time.sleep(self.RETRY_DELAY)
+                continue
+            if updates:
+                dispatcher.process_new_updates(updates)
+
+    async def run_async(self, abot, dispatcher):
+        # هندلرها و journal با SQLite کار می‌کنن؛ در thread جدا اجرا می‌شن تا
+        # یک نوشتن کند event loop و همه‌ی ارسال‌های در جریان رو نگه نداره
+        loop = asyncio.get_running_loop()
+        self._stop.clear()
+        while not self._stop.is_set():
+            try:
+                params = self.request()
+                updates = await abot.get_updates(
+                    offset=params['offset'], limit=params['limit'],
+                    allowed_updates=params['allowed_updates'], timeout=params['timeout'],
+                    request_timeout=self.timeout + 10)
+                updates = await loop.run_in_executor(None, self.accept, updates)
+            except Exception as e:
+                self.failed(e)
+                await asyncio.sleep(self.RETRY_DELAY)
+                continue
+            if updates:
+                try:
+                    await loop.run_in_executor(None, dispatcher.process_new_updates, updates)
+                except Exception as e:
+                    print(f"Error handling updates: {e}")
+
+    def stop(self):
+        # حلقه بعد از پایان getUpdates فعلی تموم می‌شه
+        self._stop.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'polls': self.polls,
+                'empty_polls': self.empty_polls,
+                'errors': self.errors,
+                'updates': self.updates,
+                'batch_avg': round(self.updates / (self.polls - self.empty_polls), 2)
+                if self.polls > self.empty_polls else 0.0,
+                'batch_max': self.batch_max,
+                'limit': self.limit,
+                'lag_avg': round(self.lag_total / self.updates, 3) if self.updates else 0.0,
+                'lag_max': round(self.lag_max, 3),
+            }
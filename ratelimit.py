@@ -0,0 +1,188 @@
+# ===============================================================
+# محدودکننده‌ی ارسال به API تلگرام 🚦
+# ===============================================================
+# محدودیت‌های تلگرام: حدود ۳۰ پیام در ثانیه برای کل ربات، حدود ۱ پیام
+# در ثانیه برای هر چت خصوصی و ۲۰ پیام در دقیقه برای هر گروه.
+# هر درخواست خروجی از RateLimiter.send_request رد می‌شه (از طریق
+# apihelper.CUSTOM_REQUEST_SENDER)؛ اگه سهمیه تموم شده باشه درخواست صبر
+# می‌کنه و اگه تلگرام 429 برگردونه، به اندازه‌ی retry_after صبر و دوباره تلاش می‌کنه.
+
+import threading
+import time
+
+import requests
+
+
+class TokenBucket:
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self, now):
+        # توکن رزرو می‌شه حتی اگه موجودی منفی بشه؛ زمان انتظار برمی‌گرده.
+        # این‌طوری درخواست‌ها به ترتیب رسیدن نوبت می‌گیرن
+        self.refill(now)
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def block(self, seconds, now):
+        # درخواست بعدی دقیقاً بعد از seconds ثانیه نوبت می‌گیره
+        self.refill(now)
+        self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+    def idle(self, now):
+        self.refill(now)
+        return self.tokens >= self.capacity
+
+
+class RateLimiter:
+    MAX_BUCKETS = 10000
+    MAX_429_RETRIES = 5
+
+    def __init__(self, global_rate=30, chat_rate=1, group_per_minute=20, burst=3,
+                 clock=time.monotonic, sleep=time.sleep, metrics=None):
+        self.clock = clock
+        # اگه باشه، هر درخواست در telegram_requests_total و telegram_request_seconds ثبت می‌شه
+        self.metrics = metrics
+        self.sleep = sleep
+        self.chat_rate = chat_rate
+        self.group_rate = group_per_minute / 60.0
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._global = TokenBucket(global_rate, global_rate, clock())
+        self._chats = {}
+        self._local = threading.local()
+
+        self.calls = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self.retries_429 = 0
+
+    def _chat_bucket(self, chat_id, now):
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) >= self.MAX_BUCKETS:
+                self._chats = {k: b for k, b in self._chats.items() if not b.idle(now)}
+            # آیدی منفی یعنی گروه یا کانال
+            rate = self.group_rate if str(chat_id).startswith('-') else self.chat_rate
+            bucket = self._chats[chat_id] = TokenBucket(rate, self.burst, now)
+        return bucket
+
+    def reserve(self, chat_id=None):
+        # زمان انتظار لازم برای یک ارسال رو برمی‌گردونه (بدون خوابیدن)
+        with self._lock:
+            now = self.clock()
+            wait = self._global.reserve(now)
+            if chat_id is not None:
+                wait = max(wait, self._chat_bucket(chat_id, now).reserve(now))
+            self.calls += 1
+            if wait > 0:
+                self.throttled += 1
+                self.wait_seconds += wait
+            return wait
+
+    def acquire(self, chat_id=None):
+        wait = self.reserve(chat_id)
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    def penalize(self, chat_id, retry_after):
+        with self._lock:
+            now = self.clock()
+            self.retries_429 += 1
+            if chat_id is None:
+                self._global.block(retry_after, now)
+            else:
+                self._chat_bucket(chat_id, now).block(retry_after, now)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'throttled': self.throttled,
+                'wait_seconds': round(self.wait_seconds, 3),
+                'retries_429': self.retries_429,
+                'chats': len(self._chats),
+            }
+
+    def observe(self, api_method, status, started):
+        # status: کد HTTP یا 'error' (خطای شبکه)؛ 429ها همین‌جا شمرده می‌شن
+        if self.metrics is not None:
+            labels = (('method', api_method),)
+            self.metrics.inc('telegram_requests_total', labels + (('status', str(status)),))
+            self.metrics.observe('telegram_request_seconds', time.perf_counter() - started, labels)
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def send_request(self, method, url, params=None, **kwargs):
+        # امضای سازگار با apihelper.CUSTOM_REQUEST_SENDER
+        chat_id = params.get('chat_id') if params else None
+        throttled = chat_id is not None
+        # فایل‌های آپلودی (مثلاً BytesIO) بعد از هر تلاش تا آخر خونده شدن
+        positions = file_positions(kwargs.get('files'))
+        for attempt in range(self.MAX_429_RETRIES + 1):
+            if throttled:
+                self.acquire(chat_id)
+            started = time.perf_counter()
+            try:
+                response = self._session().request(method, url, params=params, **kwargs)
+            except Exception:
+                self.observe(url.rsplit('/', 1)[-1], 'error', started)
+                raise
+            self.observe(url.rsplit('/', 1)[-1], response.status_code, started)
+            if response.status_code != 429 or attempt == self.MAX_429_RETRIES:
+                return response
+            retry_after = retry_after_of(response)
+            if not rewind(positions):
+                self.penalize(chat_id, retry_after)
+                return response
+            print(f"429 from Telegram, retrying after {retry_after}s (chat {chat_id})")
+            self.penalize(chat_id, retry_after)
+            if not throttled:
+                self.sleep(retry_after)
+        return response
+
+
+def retry_after_of(response):
+    # همون مقداری که ApiTelegramException.result_json['parameters'] داره
+    try:
+        return int(response.json().get('parameters', {}).get('retry_after', 1))
+    except ValueError:
+        return 1
+
+
+def file_positions(files):
+    # (فایل، جای شروع) برای هر فایل آپلودی؛ فایل بدون seek مقدار None داره
+    positions = []
+    for value in (files or {}).values():
+        stream = value[1] if isinstance(value, tuple) else value
+        if isinstance(stream, (str, bytes)):
+            continue
+        try:
+            positions.append((stream, stream.tell()))
+        except (AttributeError, OSError):
+            positions.append((stream, None))
+    return positions
+
+
+def rewind(positions):
+    # اگه فایلی قابل برگشت نباشه تلاش دوباره‌ای در کار نیست
+    for stream, position in positions:
+        if position is None:
+            return False
+        stream.seek(position)
+    return True
@@ -0,0 +1,49 @@
+# ===============================================================
+# مسیریاب پیام‌های متنی 🧭
+# ===============================================================
+# هر دکمه با کلید (حالت کاربر، متن دکمه) در یک دیکشنری ثبت می‌شه
+# و برای هر پیام فقط یک یا دو جستجو انجام می‌شه؛ مهم نیست چند تا درس داریم.
+
+ANY_STATE = None
+
+
+def normalize_text(text):
+    if text is None:
+        return None
+    return text.strip()
+
+
+def _as_list(value):
+    if value is None or isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+class Router:
+    def __init__(self):
+        self._routes = {}
+
+    def add(self, handler, texts, state=ANY_STATE):
+        for s in _as_list(state):
+            for text in _as_list(texts):
+                # مثل telebot اولین هندلر ثبت‌شده برنده‌ست
+                self._routes.setdefault((s, normalize_text(text)), handler)
+
+    def route(self, texts, state=ANY_STATE):
+        def decorator(handler):
+            self.add(handler, texts, state)
+            return handler
+        return decorator
+
+    def resolve(self, state, text):
+        text = normalize_text(text)
+        handler = self._routes.get((state, text))
+        if handler is None and state is not ANY_STATE:
+            handler = self._routes.get((ANY_STATE, text))
+        return handler
+
+    def routes(self):
+        return list(self._routes.items())
+
+    def __len__(self):
+        return len(self._routes)
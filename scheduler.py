@@ -0,0 +1,134 @@
+# ===============================================================
+# زمان‌بند مشترک ⏱️
+# ===============================================================
+# به‌جای یک threading.Timer (یعنی یک thread سیستم‌عامل) برای هر مهلت، همه‌ی
+# مهلت‌ها در یک heap نگه داشته می‌شن و یک thread تا نزدیک‌ترین مهلت می‌خوابه.
+# هر کار یک کلید داره (مثلاً media_group_id): زمان‌بندی دوباره‌ی همون کلید
+# مهلت قبلی رو باطل می‌کنه. ورودی‌های باطل‌شده از heap پاک نمی‌شن، فقط
+# وقتی به سر heap برسن نادیده گرفته می‌شن.
+# کارهای سررسیدشده روی workers thread ثابت اجرا می‌شن (0 یعنی روی همون
+# thread زمان‌بند)، تا یک ارسال کند مهلت‌های بعدی رو عقب نندازه.
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Scheduler:
+    def __init__(self, workers=0, clock=time.monotonic):
+        self.clock = clock
+        self.workers = workers
+        self._executor = None
+        self._heap = []
+        # کلید -> ورودی فعلی [deadline, seq, key, callback, args]
+        self._entries = {}
+        self._seq = itertools.count()
+        self._changed = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+        self.scheduled = 0
+        self.fired = 0
+        self.failed = 0
+
+    def start(self):
+        with self._changed:
+            if self._thread is None:
+                self._stopped = False
+                if self.workers:
+                    self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="scheduled")
+                self._thread = threading.Thread(target=self._run, name="scheduler", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        with self._changed:
+            self._stopped = True
+            self._changed.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def schedule(self, key, delay, callback, *args):
+        # اجرای callback(*args) بعد از delay ثانیه؛ مهلت قبلی همین کلید باطل می‌شه
+        return self.schedule_at(key, self.clock() + delay, callback, *args)
+
+    def schedule_at(self, key, deadline, callback, *args):
+        entry = [deadline, next(self._seq), key, callback, args]
+        with self._changed:
+            self._entries[key] = entry
+            heapq.heappush(self._heap, entry)
+            self.scheduled += 1
+            if self._heap[0] is entry:
+                self._changed.notify()
+        return deadline
+
+    def cancel(self, key):
+        with self._changed:
+            return self._entries.pop(key, None) is not None
+
+    def deadline(self, key):
+        with self._changed:
+            entry = self._entries.get(key)
+            return entry[0] if entry is not None else None
+
+    def _next_due(self):
+        # ورودی سررسیدشده‌ی بعدی، یا None و مدت خواب تا مهلت بعدی
+        while self._heap:
+            entry = self._heap[0]
+            if self._entries.get(entry[2]) is not entry:
+                heapq.heappop(self._heap)
+                continue
+            wait = entry[0] - self.clock()
+            if wait > 0:
+                return None, wait
+            heapq.heappop(self._heap)
+            del self._entries[entry[2]]
+            return entry, 0
+        return None, None
+
+    def _run(self):
+        while True:
+            with self._changed:
+                while True:
+                    if self._stopped:
+                        return
+                    entry, wait = self._next_due()
+                    if entry is not None:
+                        break
+                    self._changed.wait(wait)
+            if self._executor is not None:
+                self._executor.submit(self._fire, entry)
+            else:
+                self._fire(entry)
+
+    def _fire(self, entry):
+        _, _, key, callback, args = entry
+        try:
+            callback(*args)
+        except Exception as e:
+            with self._changed:
+                self.failed += 1
+            print(f"Scheduled task {key!r} failed: {e}")
+        else:
+            with self._changed:
+                self.fired += 1
+
+    def __len__(self):
+        with self._changed:
+            return len(self._entries)
+
+    def stats(self):
+        with self._changed:
+            return {
+                'pending': len(self._entries),
+                'heap': len(self._heap),
+                'scheduled': self.scheduled,
+                'fired': self.fired,
+                'failed': self.failed,
+            }
@@ -0,0 +1,590 @@
+# ===============================================================
+# ذخیره‌سازی پایدار حالت کاربران (SQLite در حالت WAL) 🧠
+# ===============================================================
+# به‌جای بازنویسی کل user_states.json هر ۳۰ ثانیه، فقط کاربرهایی که
+# حالتشون عوض شده در یک تراکنش نوشته می‌شن. SQLite تراکنش رو اتمیک
+# انجام می‌ده، پس کرش وسط نوشتن فایل رو خراب نمی‌کنه.
+# رابطش مثل dict قبلیه: user_states.get(uid) و user_states[uid] = 'HOME'
+#
+# در حافظه فقط کاربرهای فعال نگه داشته می‌شن (LRU با سقف تعداد و TTL):
+# کاربری که مدتی کاری نکرده از حافظه بیرون می‌ره و هر وقت برگرده حالتش
+# از دیتابیس خونده می‌شه. پس مصرف RAM به تعداد کاربرهای فعال بستگی داره،
+# نه به همه‌ی کسانی که تا حالا /start زدن.
+#
+# اسم حالت‌ها (مثل 'oloomtash_1naz_anatomy_farhanni_manba_jozve') فقط یک
+# بار ذخیره می‌شن و هر کاربر فقط یک شماره‌ی کوچک (node id) داره؛ هم در
+# حافظه (آرایه‌های فشرده‌ی IntTable) و هم در دیتابیس (ستون INTEGER).
+# شماره‌ها در جدول state_names ثابت می‌مونن، پس تغییر catalog.json
+# حالت ذخیره‌شده‌ی کاربرها رو جابه‌جا نمی‌کنه.
+#
+# لایه‌ی داغ به چند بخش (shard) تقسیم شده و هر بخش قفل خودش رو داره
+# (user_id % shards)؛ threadهای هندلر که با کاربرهای مختلف کار می‌کنن
+# پشت هم منتظر نمی‌مونن. ذخیره‌کننده با snapshot() یک تصویر ثابت از
+# همه‌ی تغییرهای ذخیره‌نشده می‌گیره.
+#
+# پشته‌ی ناوبری هر کاربر (مثلاً HOME/TERM_1/oloomtash_1) هم به همون شکل
+# یک رشته‌ی شماره‌گذاری‌شده‌ست؛ تعداد مسیرهای ممکن کمه، پس پشته هیچ
+# حافظه‌ی اضافه‌ای به ازای کاربر نمی‌گیره. get() همیشه بالای پشته
+# (منوی فعلی) رو برمی‌گردونه.
+#
+# حالت shared (چند worker گانیکورن روی یک فایل): لایه‌ی داغ و بافر تغییرها
+# خاموش می‌شن و هر خوندن/نوشتن مستقیم روی SQLite انجام می‌شه تا همه‌ی
+# پروسه‌ها همیشه آخرین حالت رو ببینن.
+
+import heapq
+import json
+import os
+import threading
+import time
+from array import array
+
+from db import ThreadConnections, connect, transaction
+
+_MISSING = object()
+# شماره‌ی صفر یعنی «این کاربر در دیتابیس هم حالتی نداره»؛ در حافظه نگه
+# داشته می‌شه تا هر بار کوئری نزنیم
+ABSENT = 0
+MAX_STATE_ID = 0xFFFF
+PATH_SEP = '/'
+
+
+def user_key(user_id):
+    # کلید همیشه int (همون message.from_user.id)؛ json.load کلیدها رو str
+    # برمی‌گردوند و بعد از هر ری‌استارت همه‌ی get ها خالی برمی‌گشتن
+    if isinstance(user_id, bool):
+        raise TypeError(f"user id must be int, got {user_id!r}")
+    if isinstance(user_id, str):
+        user_id = int(user_id.strip())
+    elif not isinstance(user_id, int):
+        raise TypeError(f"user id must be int, got {type(user_id).__name__}")
+    if user_id == 0:
+        # صفر در IntTable یعنی خونه‌ی خالی
+        raise ValueError("user id 0 is reserved")
+    return user_id
+
+
+def state_value(state):
+    if not isinstance(state, str):
+        raise TypeError(f"state must be str, got {type(state).__name__}")
+    if PATH_SEP in state or not state:
+        raise ValueError(f"invalid state {state!r}")
+    return state
+
+
+# ===============================================================
+# جدول فشرده‌ی user_id -> node id
+# ===============================================================
+# open addressing با probe خطی روی سه آرایه: ۸ بایت کلید، ۲ بایت شماره‌ی
+# حالت و ۴ بایت زمان آخرین دسترسی (ثانیه). هر خونه ۱۴ بایته،
+# به‌جای چند شیء پایتونی (int + str + tuple + ورودی dict).
+
+class IntTable:
+    def __init__(self, size=1024):
+        self._alloc(size)
+        self._used = 0
+
+    def _alloc(self, size):
+        slots = 8
+        while slots < size:
+            slots <<= 1
+        self._keys = array('q', bytes(8 * slots))
+        self._values = array('H', bytes(2 * slots))
+        self._stamps = array('I', bytes(4 * slots))
+        self._mask = slots - 1
+
+    def _home(self, key):
+        return ((key * 0x9E3779B97F4A7C15) >> 24) & self._mask
+
+    def _slot(self, key):
+        keys = self._keys
+        mask = self._mask
+        i = self._home(key)
+        while True:
+            k = keys[i]
+            if k == key or k == 0:
+                return i
+            i = (i + 1) & mask
+
+    def _grow(self):
+        keys, values, stamps = self._keys, self._values, self._stamps
+        self._alloc(len(keys) * 2)
+        for i, key in enumerate(keys):
+            if key:
+                j = self._slot(key)
+                self._keys[j] = key
+                self._values[j] = values[i]
+                self._stamps[j] = stamps[i]
+
+    def get(self, key, stamp=None):
+        i = self._slot(key)
+        if self._keys[i] == 0:
+            return None
+        if stamp is not None:
+            self._stamps[i] = stamp
+        return self._values[i]
+
+    def put(self, key, value, stamp):
+        # ضریب پر شدن حداکثر ۷۵٪؛ بیشتر از این زنجیره‌های probe بلند می‌شن
+        if (self._used + 1) * 4 > len(self._keys) * 3:
+            self._grow()
+        i = self._slot(key)
+        if self._keys[i] == 0:
+            self._keys[i] = key
+            self._used += 1
+        self._values[i] = value
+        self._stamps[i] = stamp
+
+    def pop(self, key):
+        keys, values, stamps = self._keys, self._values, self._stamps
+        mask = self._mask
+        i = self._slot(key)
+        if keys[i] == 0:
+            return None
+        value = values[i]
+        # حذف با جابه‌جایی رو به عقب (بدون tombstone)
+        j = i
+        while True:
+            j = (j + 1) & mask
+            k = keys[j]
+            if k == 0:
+                break
+            home = self._home(k)
+            if (i < j and (home <= i or home > j)) or (j < i and home <= i and home > j):
+                keys[i] = k
+                values[i] = values[j]
+                stamps[i] = stamps[j]
+                i = j
+        keys[i] = 0
+        values[i] = 0
+        stamps[i] = 0
+        self._used -= 1
+        return value
+
+    def items(self):
+        # (user_id, node id, stamp)
+        keys, values, stamps = self._keys, self._values, self._stamps
+        return [(k, values[i], stamps[i]) for i, k in enumerate(keys) if k]
+
+    def __contains__(self, key):
+        return self._keys[self._slot(key)] != 0
+
+    def __len__(self):
+        return self._used
+
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in (self._keys, self._values, self._stamps))
+
+
+class StateShard:
+    __slots__ = ('lock', 'hot', 'dirty', 'hits', 'fault_ins', 'evictions', 'expirations')
+
+    def __init__(self, size):
+        self.lock = threading.Lock()
+        self.hot = IntTable(size)
+        # user_id -> node id (یا ABSENT برای حذف) که هنوز در دیتابیس نوشته نشده
+        self.dirty = {}
+        self.hits = 0
+        self.fault_ins = 0
+        self.evictions = 0
+        self.expirations = 0
+
+
+class StateStore:
+    # درصدی از ظرفیت که وقتی جدول پر شد یک‌جا بیرون می‌ره
+    EVICT_FRACTION = 8
+    # فاصله‌ی بین دو پیمایش TTL (ثانیه)
+    EXPIRE_INTERVAL = 60
+
+    def __init__(self, path, capacity=50000, ttl=3600, shards=16, shared=False,
+                 clock=time.monotonic, metrics=None):
+        self.db_path = path
+        self.shared = shared
+        # اگه باشه، مدت هر نوشتن در دیتابیس در state_write_seconds ثبت می‌شه
+        self.metrics = metrics
+        self.capacity = capacity
+        self.shard_capacity = max(1, capacity // max(1, shards))
+        self.ttl = ttl
+        self.clock = clock
+        self._epoch = clock()
+        self._db = self._connect()
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS state_names ("
+            "id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS user_nodes ("
+            "user_id INTEGER PRIMARY KEY, node INTEGER NOT NULL)")
+        self._db_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._names_lock = threading.Lock()
+
+        # node id -> اسم حالت / مسیر (خونه‌ی صفر خالیه) و برعکس
+        self._names = [None]
+        self._paths = [()]
+        self._ids = {}
+        self._sync_names()
+
+        size = min(self.shard_capacity, 1024) * 2
+        self._shards = [StateShard(size) for _ in range(max(1, shards))]
+        # هر thread اتصال خواندنی خودش رو داره؛ در حالت WAL خوندن‌ها نه
+        # منتظر هم می‌مونن و نه منتظر تراکنش flush
+        self._readers = ThreadConnections(path)
+
+        self.flushes = 0
+        self.rows_written = 0
+
+        self._migrate_text_table()
+
+    def _connect(self):
+        db = connect(self.db_path)
+        db.execute("PRAGMA journal_mode=WAL")
+        return db
+
+    def reopen(self):
+        # بعد از fork (worker گانیکورن) اتصال نوشتن پروسه‌ی والد نباید
+        # استفاده بشه؛ اتصال‌های خواندنی خودشون pid رو بررسی می‌کنن
+        with self._db_lock:
+            self._db = self._connect()
+
+    # --- شماره‌گذاری حالت‌ها ---
+
+    def _add_name(self, state_id, name):
+        while len(self._names) <= state_id:
+            self._names.append(None)
+            self._paths.append(())
+        self._names[state_id] = name
+        self._paths[state_id] = tuple(name.split(PATH_SEP))
+        self._ids[name] = state_id
+
+    def _sync_names(self):
+        # شماره‌هایی که این پروسه هنوز ندیده (مثلاً worker دیگه‌ای ثبت کرده)
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT id, name FROM state_names WHERE id >= ? ORDER BY id",
+                (len(self._names),)).fetchall()
+        for state_id, name in rows:
+            self._add_name(state_id, name)
+
+    def intern_all(self, names):
+        # شماره‌ی حالت‌های جدید پشت‌سرهم و در یک تراکنش ثبت می‌شه؛ شماره‌ی
+        # حالت‌های قبلی هیچ‌وقت عوض نمی‌شه. شماره رو خود SQLite می‌ده تا دو
+        # پروسه هیچ‌وقت یک شماره رو به دو اسم ندن
+        with self._names_lock:
+            new = []
+            for name in names:
+                name = PATH_SEP.join(map(state_value, name.split(PATH_SEP)))
+                if name not in self._ids and name not in new:
+                    new.append(name)
+            if not new:
+                return 0
+            with self._db_lock, transaction(self._db):
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO state_names (name) VALUES (?)", [(n,) for n in new])
+            self._sync_names()
+            if len(self._names) - 1 > MAX_STATE_ID:
+                raise OverflowError(f"more than {MAX_STATE_ID} distinct states")
+            return len(new)
+
+    def _path_of(self, state_id):
+        if state_id >= len(self._paths):
+            with self._names_lock:
+                self._sync_names()
+        return self._paths[state_id]
+
+    def state_id(self, name):
+        state_id = self._ids.get(name)
+        if state_id is None:
+            self.intern_all([name])
+            state_id = self._ids[name]
+        return state_id
+
+    def state_name(self, state_id):
+        return self._path_of(state_id)[-1] if state_id else None
+
+    def _migrate_text_table(self):
+        # جدول قدیمی user_states (ستون state از نوع TEXT) یک بار به
+        # user_nodes منتقل و حذف می‌شه
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(user_states)")]
+        if 'state' not in columns:
+            return 0
+        rows = self._db.execute("SELECT user_id, state FROM user_states").fetchall()
+        self.intern_all(sorted({state for _, state in rows}))
+        with self._db_lock:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT OR IGNORE INTO user_nodes (user_id, node) VALUES (?, ?)",
+                [(uid, self._ids[state]) for uid, state in rows])
+            self._db.execute("DROP TABLE user_states")
+            self._db.execute("COMMIT")
+            self._db.execute("VACUUM")
+        print(f"Migrated {len(rows)} user states to interned node ids")
+        return len(rows)
+
+    # --- لایه‌ی داغ (حافظه) ---
+
+    def _now(self):
+        return int(self.clock() - self._epoch)
+
+    def _shard(self, user_id):
+        return self._shards[user_id % len(self._shards)]
+
+    def _reader(self):
+        if self.db_path == ':memory:':
+            return None
+        return self._readers()
+
+    def _load(self, user_id):
+        query = "SELECT node FROM user_nodes WHERE user_id = ?"
+        reader = self._reader()
+        if reader is None:
+            with self._db_lock:
+                row = self._db.execute(query, (user_id,)).fetchone()
+        else:
+            row = reader.execute(query, (user_id,)).fetchone()
+        return row[0] if row else ABSENT
+
+    def _lookup(self, user_id):
+        if self.shared:
+            return self._load(user_id)
+        shard = self._shard(user_id)
+        now = self._now()
+        with shard.lock:
+            state_id = shard.hot.get(user_id, now)
+            if state_id is not None:
+                shard.hits += 1
+                return state_id
+        state_id = self._load(user_id)
+        with shard.lock:
+            # ممکنه وسط خوندن از دیتابیس، یک thread دیگه مقدار جدید نوشته باشه
+            current = shard.hot.get(user_id)
+            if current is not None:
+                return current
+            shard.fault_ins += 1
+            shard.hot.put(user_id, state_id, now)
+            self._evict_over_capacity(shard)
+        return state_id
+
+    def _evict_over_capacity(self, shard):
+        # وقتی بخش پر بشه، یک‌هشتم قدیمی‌ترین‌ها یک‌جا بیرون می‌رن (LRU با
+        # دقت یک ثانیه)؛ کاربرهایی که تغییرشون هنوز ذخیره نشده می‌مونن
+        capacity = self.shard_capacity
+        if len(shard.hot) <= capacity:
+            return
+        count = len(shard.hot) - capacity + max(1, capacity // self.EVICT_FRACTION)
+        candidates = ((stamp, uid) for uid, _, stamp in shard.hot.items() if uid not in shard.dirty)
+        for _, uid in heapq.nsmallest(count, candidates):
+            shard.hot.pop(uid)
+            shard.evictions += 1
+
+    def expire(self):
+        # کاربرهایی که بیشتر از ttl ثانیه کاری نکردن از حافظه بیرون می‌رن؛
+        # هر بار فقط قفل یک بخش گرفته می‌شه
+        deadline = self._now() - self.ttl
+        total = 0
+        for shard in self._shards:
+            with shard.lock:
+                expired = [uid for uid, _, stamp in shard.hot.items()
+                           if stamp <= deadline and uid not in shard.dirty]
+                for uid in expired:
+                    shard.hot.pop(uid)
+                shard.expirations += len(expired)
+            total += len(expired)
+        return total
+
+    # --- رابط شبیه dict (کلیدها همیشه int می‌شن) ---
+
+    def get(self, user_id, default=None):
+        state_id = self._lookup(user_key(user_id))
+        return default if state_id == ABSENT else self._path_of(state_id)[-1]
+
+    def __getitem__(self, user_id):
+        state_id = self._lookup(user_key(user_id))
+        if state_id == ABSENT:
+            raise KeyError(user_id)
+        return self._path_of(state_id)[-1]
+
+    def __setitem__(self, user_id, state):
+        user_id = user_key(user_id)
+        self._store(user_id, self.state_id(state_value(state)))
+
+    def path(self, user_id):
+        # پشته‌ی ناوبری کاربر از ریشه تا منوی فعلی؛ () اگه حالتی نداره
+        return self._path_of(self._lookup(user_key(user_id)))
+
+    def set_path(self, user_id, path):
+        user_id = user_key(user_id)
+        self._store(user_id, self.state_id(PATH_SEP.join(map(state_value, path))))
+
+    def __delitem__(self, user_id):
+        user_id = user_key(user_id)
+        if self._lookup(user_id) == ABSENT:
+            raise KeyError(user_id)
+        self._store(user_id, ABSENT)
+
+    def __contains__(self, user_id):
+        return self._lookup(user_key(user_id)) != ABSENT
+
+    def __len__(self):
+        return sum(len(shard.hot) for shard in self._shards)
+
+    def _observe_write(self, op, started):
+        if self.metrics is not None:
+            self.metrics.observe('state_write_seconds', time.perf_counter() - started, (('op', op),))
+
+    def _write_through(self, user_id, state_id):
+        started = time.perf_counter()
+        with self._db_lock:
+            if state_id == ABSENT:
+                self._db.execute("DELETE FROM user_nodes WHERE user_id = ?", (user_id,))
+            else:
+                self._db.execute(
+                    "INSERT INTO user_nodes (user_id, node) VALUES (?, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE SET node = excluded.node", (user_id, state_id))
+            self.rows_written += 1
+        self._observe_write('write_through', started)
+
+    def _store(self, user_id, state_id):
+        if self.shared:
+            return self._write_through(user_id, state_id)
+        shard = self._shard(user_id)
+        now = self._now()
+        with shard.lock:
+            previous = shard.hot.get(user_id)
+            shard.hot.put(user_id, state_id, now)
+            if previous != state_id:
+                shard.dirty[user_id] = state_id
+            self._evict_over_capacity(shard)
+
+    def stats(self):
+        totals = dict.fromkeys(('hot', 'hot_bytes', 'dirty', 'hits', 'fault_ins',
+                                'evictions', 'expirations'), 0)
+        for shard in self._shards:
+            with shard.lock:
+                totals['hot'] += len(shard.hot)
+                totals['hot_bytes'] += shard.hot.nbytes()
+                totals['dirty'] += len(shard.dirty)
+                totals['hits'] += shard.hits
+                totals['fault_ins'] += shard.fault_ins
+                totals['evictions'] += shard.evictions
+                totals['expirations'] += shard.expirations
+        totals.update(shards=len(self._shards), shared=self.shared, states=len(self._ids),
+                      flushes=self.flushes, rows_written=self.rows_written)
+        return totals
+
+    def count_by_state(self):
+        # تعداد کاربرهای هر منو (بالای پشته) طبق دیتابیس؛ تغییرهای هنوز
+        # ذخیره‌نشده (حداکثر چند ثانیه) حساب نمی‌شن. فقط برای گزارش‌ها
+        query = "SELECT node, COUNT(*) FROM user_nodes GROUP BY node"
+        reader = self._reader()
+        if reader is None:
+            with self._db_lock:
+                rows = self._db.execute(query).fetchall()
+        else:
+            rows = reader.execute(query).fetchall()
+        counts = {}
+        for state_id, users in rows:
+            name = self.state_name(state_id)
+            counts[name] = counts.get(name, 0) + users
+        return counts
+
+    # --- تصویر ثابت برای ذخیره‌کننده ---
+
+    def snapshot(self):
+        # همه‌ی تغییرهای ذخیره‌نشده در یک لحظه‌ی واحد: قفل همه‌ی بخش‌ها (همیشه
+        # به یک ترتیب) گرفته می‌شه، پس هیچ نوشتنی نصفه در تصویر نمیاد
+        for shard in self._shards:
+            shard.lock.acquire()
+        try:
+            return {uid: sid for shard in self._shards for uid, sid in shard.dirty.items()}
+        finally:
+            for shard in reversed(self._shards):
+                shard.lock.release()
+
+    # --- نوشتن تغییرات ---
+
+    def flush(self):
+        with self._write_lock:
+            changed = self.snapshot()
+            if not changed:
+                return 0
+            upserts = [(uid, sid) for uid, sid in changed.items() if sid != ABSENT]
+            deletes = [(uid,) for uid, sid in changed.items() if sid == ABSENT]
+            started = time.perf_counter()
+            with self._db_lock:
+                try:
+                    self._db.execute("BEGIN")
+                    self._db.executemany(
+                        "INSERT INTO user_nodes (user_id, node) VALUES (?, ?) "
+                        "ON CONFLICT(user_id) DO UPDATE SET node = excluded.node", upserts)
+                    self._db.executemany("DELETE FROM user_nodes WHERE user_id = ?", deletes)
+                    self._db.execute("COMMIT")
+                except Exception:
+                    # تغییرها در _dirty می‌مونن و دفعه‌ی بعد دوباره تلاش می‌شه
+                    self._db.execute("ROLLBACK")
+                    raise
+            self._observe_write('flush', started)
+            for shard in self._shards:
+                with shard.lock:
+                    # فقط چیزهایی که در این فاصله دوباره عوض نشدن تمیز حساب می‌شن؛
+                    # dict از نو ساخته می‌شه چون با del حافظه‌اش کوچیک نمی‌شه
+                    if shard.dirty:
+                        shard.dirty = {uid: sid for uid, sid in shard.dirty.items()
+                                       if changed.get(uid, _MISSING) != sid}
+                    # کاربرهایی که فقط به‌خاطر تغییر ذخیره‌نشده مونده بودن حالا
+                    # بیرون می‌رن، نه موقع فراخوانی بعدی همین بخش
+                    self._evict_over_capacity(shard)
+            self.flushes += 1
+            self.rows_written += len(changed)
+            return len(changed)
+
+    def import_json(self, json_path):
+        # مهاجرت از user_states.json قدیمی: کلیدهای str به int تبدیل می‌شن،
+        # ردیف‌هایی که در دیتابیس هستن (جدیدترن) دست نمی‌خورن و فایل بعد از
+        # مهاجرت به .migrated تغییر نام می‌ده تا دوباره خونده نشه
+        if not os.path.exists(json_path):
+            return 0
+        with open(json_path, 'r') as f:
+            old_states = json.load(f)
+        rows = []
+        skipped = 0
+        for raw_id, state in old_states.items():
+            try:
+                rows.append((user_key(raw_id), state_value(state)))
+            except (TypeError, ValueError):
+                skipped += 1
+        self.intern_all(sorted({state for _, state in rows}))
+        with self._db_lock:
+            self._db.execute("BEGIN")
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO user_nodes (user_id, node) VALUES (?, ?)",
+                [(uid, self._ids[state]) for uid, state in rows])
+            imported = self._db.total_changes - before
+            self._db.execute("COMMIT")
+        # اگه کسی از قبل در حافظه بود، دوباره از دیتابیس خونده بشه
+        for user_id, _ in rows:
+            shard = self._shard(user_id)
+            with shard.lock:
+                if user_id not in shard.dirty:
+                    shard.hot.pop(user_id)
+        os.replace(json_path, json_path + ".migrated")
+        print(f"Migrated {imported} user states from {json_path} ({skipped} invalid entries skipped)")
+        return imported
+
+    def autosave(self, interval):
+        def loop():
+            next_expire = time.monotonic() + self.EXPIRE_INTERVAL
+            while True:
+                time.sleep(interval)
+                try:
+                    self.flush()
+                    if time.monotonic() >= next_expire:
+                        self.expire()
+                        next_expire = time.monotonic() + self.EXPIRE_INTERVAL
+                except Exception as e:
+                    print(f"Error saving user states: {e}")
+        threading.Thread(target=loop, name="state-autosave", daemon=True).start()
+
+    def close(self):
+        self.flush()
+        with self._db_lock:
+            self._db.close()
@@ -0,0 +1,67 @@
+# ===============================================================
+# دفترچه‌ی آپدیت‌های پردازش‌شده 📒
+# ===============================================================
+# update_id هر آپدیت قبل از رسیدن به هندلرها در SQLite ثبت می‌شه (یک
+# تراکنش برای هر دسته). اگه همون آپدیت دوباره برسه (دسته‌ای که تأییدش به
+# تلگرام نرسیده و بعد از ری‌استارت دوباره میاد، تکرار webhook، یا worker
+# دیگه)، نادیده گرفته می‌شه. بزرگ‌ترین update_id ثبت‌شده offset شروع
+# polling بعد از ری‌استارته.
+#
+# یعنی هر آپدیت حداکثر یک بار پردازش می‌شه: اگه پروسه وسط کار هندلر بمیره،
+# اون آپدیت تکرار نمی‌شه (کاربر دوباره دکمه رو می‌زنه) ولی ارسال ۴۰ ویدیو
+# هم دوباره انجام نمی‌شه.
+
+import threading
+import time
+
+from db import ThreadConnections, connect, transaction
+
+
+class UpdateJournal:
+    # اگه یک هفته آپدیتی نیاد، تلگرام شماره‌ی آپدیت بعدی رو تصادفی انتخاب
+    # می‌کنه؛ offset قدیمی‌تر از این استفاده نمی‌شه
+    OFFSET_MAX_AGE = 6 * 24 * 3600
+
+    def __init__(self, path, window=1000, clock=time.time):
+        self.path = path
+        self.window = window
+        self.clock = clock
+        self._db = ThreadConnections(path)
+        self._lock = threading.Lock()
+        self.claimed = 0
+        self.duplicates = 0
+        db = connect(path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS seen_updates ("
+            "update_id INTEGER PRIMARY KEY, seen REAL NOT NULL)")
+        db.close()
+
+    def offset(self):
+        # offset برای اولین getUpdates بعد از ری‌استارت (None یعنی از تلگرام بپرس)
+        row = self._db().execute("SELECT MAX(update_id), MAX(seen) FROM seen_updates").fetchone()
+        if row[0] is None or self.clock() - row[1] > self.OFFSET_MAX_AGE:
+            return None
+        return row[0] + 1
+
+    def claim(self, updates):
+        # آپدیت‌هایی که قبلاً دیده نشدن رو ثبت می‌کنه و برمی‌گردونه
+        db = self._db()
+        fresh = []
+        now = self.clock()
+        with transaction(db):
+            for update in updates:
+                if db.execute("INSERT OR IGNORE INTO seen_updates (update_id, seen) VALUES (?, ?)",
+                              (update.update_id, now)).rowcount:
+                    fresh.append(update)
+            if fresh:
+                db.execute("DELETE FROM seen_updates WHERE update_id <= "
+                           "(SELECT MAX(update_id) FROM seen_updates) - ?", (self.window,))
+        with self._lock:
+            self.claimed += len(fresh)
+            self.duplicates += len(updates) - len(fresh)
+        return fresh
+
+    def stats(self):
+        with self._lock:
+            return {'claimed': self.claimed, 'duplicates': self.duplicates}